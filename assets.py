@@ -0,0 +1,196 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+import pygame
+
+
+class Silence(object):
+    """Stands for a sound that could not be loaded, playing nothing."""
+
+    def play(self, *args, **kwargs):
+        """Play nothing."""
+        return None
+
+    def stop(self):
+        """Do nothing."""
+
+    def fadeout(self, ms):
+        """Do nothing."""
+
+    def set_volume(self, value):
+        """Do nothing."""
+
+    def get_volume(self):
+        """Get no volume at all."""
+        return 0.0
+
+    def get_length(self):
+        """Get no length at all."""
+        return 0.0
+
+
+class AssetManager(object):
+    """Load images and sounds in the background.
+
+    Assets are loaded in the order they are asked for, one at a time, by
+    a worker thread, so the first frame can be drawn right away. Getting
+    an asset waits for it only when it is not loaded yet.
+
+    Attributes:
+        started (float): When the game started, from time.perf_counter.
+        first_frame (float): Seconds from the start to the first frame
+                             on screen, None before it.
+        times (dict): Seconds each asset took to load.
+        waits (dict): Seconds the game (its main thread) waited for each
+                      asset.
+    """
+
+    def __init__(self, started=None):
+        """
+        Args:
+            started (float): When the game started, from
+                             time.perf_counter, now if omitted.
+        """
+        super(AssetManager, self).__init__()
+        self.started = time.perf_counter() if started is None else started
+        self.first_frame = None
+        self.times = {}
+        self.waits = {}
+        self._futures = {}
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def load(self, name, loader, *args):
+        """Start loading an asset in the background, unless it was
+        already asked for, like by another game sharing the manager.
+
+        Args:
+            name (str): Name the asset is got by.
+            loader (callable): Makes the asset out of the args.
+        """
+        if name in self._futures:
+            return
+        self._futures[name] = self._executor.submit(
+            self._timed, name, loader, *args
+        )
+
+    def _timed(self, name, loader, *args):
+        """Call a loader, keeping how long it took."""
+        start = time.perf_counter()
+        asset = loader(*args)
+        self.times[name] = time.perf_counter() - start
+        return asset
+
+    def sound(self, name, file_name, volume=1.0):
+        """Start loading a sound in the background.
+
+        A sound that cannot be loaded, like a missing file or when there
+        is no audio device, is replaced by a Silence.
+
+        Args:
+            name (str): Name the sound is got by.
+            file_name (str): Sound (full path) file name.
+            volume (float): Volume of the sound, from 0 to 1.
+        """
+        self.load(name, self._load_sound, file_name, volume)
+
+    @staticmethod
+    def _load_sound(file_name, volume):
+        try:
+            sound = pygame.mixer.Sound(file_name)
+        except (pygame.error, FileNotFoundError):
+            return Silence()
+        sound.set_volume(volume)
+        return sound
+
+    @staticmethod
+    def music(file_name):
+        """Get a music file to stream, None if there is no such file.
+
+        Args:
+            file_name (str): Music (full path) file name.
+        """
+        return file_name if path.exists(file_name) else None
+
+    def get(self, name):
+        """Get an asset, waiting for it to be loaded if needed.
+
+        Only the first wait of the main thread is kept in waits.
+
+        Args:
+            name (str): Name the asset was loaded with.
+
+        Raises:
+            KeyError: If no asset was loaded with that name.
+        """
+        future = self._futures[name]
+        main = threading.current_thread() is threading.main_thread()
+        if main and name not in self.waits:
+            start = time.perf_counter()
+            future.result()
+            self.waits[name] = time.perf_counter() - start
+        return future.result()
+
+    def result(self, name):
+        """Get an asset from a loader of another asset.
+
+        The loaders run one at a time in the order they were asked for,
+        so the assets asked for earlier are already loaded.
+
+        Args:
+            name (str): Name the asset was loaded with.
+
+        Raises:
+            KeyError: If no asset was loaded with that name.
+        """
+        return self._futures[name].result()
+
+    def frame_shown(self):
+        """Take note of a frame being shown, keeping when the first was."""
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter() - self.started
+
+    def report(self):
+        """Get how long the startup and every asset took.
+
+        Returns:
+            A list of lines of text.
+        """
+        lines = []
+        if self.first_frame is not None:
+            lines.append(f"first frame {self.first_frame * 1e3:.1f}ms")
+        for name, future in self._futures.items():
+            if not future.done():
+                lines.append(f"{name:<20}still loading")
+                continue
+            seconds = self.times.get(name, 0.0)
+            wait = self.waits.get(name)
+            waited = "not used" if wait is None else f"{wait * 1e3:.1f}ms"
+            lines.append(
+                f"{name:<20}loaded in {seconds * 1e3:>7.1f}ms,"
+                f" waited {waited}"
+            )
+        return lines
+
+    def close(self):
+        """Stop loading assets."""
+        self._executor.shutdown(wait=False)
+
+
+class Lazy(object):
+    """A Game attribute got from its AssetManager on first use.
+
+    Once got, the asset is kept on the game like any attribute, so using
+    it costs nothing more.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        asset = instance.assets.get(self.name)
+        instance.__dict__[self.name] = asset
+        return asset
@@ -0,0 +1,155 @@
+import math
+
+import pygame
+
+import settings
+
+
+class _Voice(object):
+    """A reserved mixer channel and the sound it is playing."""
+
+    def __init__(self, channel):
+        super(_Voice, self).__init__()
+        self.channel = channel
+        self.name = None
+        self.priority = 0
+        self.started = 0
+        self.ends = 0
+
+
+class Mixer(object):
+    """Play the sound effects on a few reserved channels.
+
+    Every category of sounds has its own channels, so a burst of sounds
+    of one category never silences the others. A sound is dropped when
+    played again before its cooldown is over, or when all the channels
+    of its category are playing sounds of a higher priority, otherwise
+    it takes a free channel or the oldest one playing a sound of the
+    lowest priority.
+
+    Time is counted in game updates, and a sound is taken as playing for
+    as long as it lasts, so the same updates always play the same sounds
+    and no channel is ever asked whether it is busy.
+
+    Attributes:
+        game (Game): The game, its sounds are got from its <name>_sound
+                     attributes.
+        effects (dict): Category, priority and cooldown of every sound.
+        played (int): How many sounds were played.
+        dropped (int): How many sounds were not played.
+        stolen (int): How many sounds were cut short by another one.
+        peak (int): The most voices ever in use at once.
+    """
+
+    def __init__(
+        self,
+        game,
+        effects=settings.SOUND_EFFECTS,
+        channels=settings.SOUND_CHANNELS,
+    ):
+        """
+        Args:
+            game (Game): The game, its sounds are got from its
+                         <name>_sound attributes.
+            effects (dict): Category, priority and cooldown of every
+                            sound.
+            channels (dict): How many channels each category reserves.
+        """
+        super(Mixer, self).__init__()
+        self.game = game
+        self.effects = effects
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+        self.peak = 0
+        self._voices = {}
+        self._last = {}
+        self._lengths = {}
+        audible = pygame.mixer.get_init() is not None
+        total = sum(channels.values())
+        if audible:
+            # the reserved channels are never picked by Sound.play
+            pygame.mixer.set_num_channels(
+                max(pygame.mixer.get_num_channels(), total)
+            )
+            pygame.mixer.set_reserved(total)
+        number = 0
+        for category, count in channels.items():
+            self._voices[category] = []
+            for _ in range(count):
+                channel = pygame.mixer.Channel(number) if audible else None
+                self._voices[category].append(_Voice(channel))
+                number += 1
+
+    def reset(self):
+        """Stop every sound and forget the cooldowns, for a new game."""
+        for voices in self._voices.values():
+            for voice in voices:
+                if voice.channel:
+                    voice.channel.stop()
+                voice.name = None
+                voice.ends = 0
+        self._last.clear()
+
+    def play(self, name):
+        """Play a sound effect, unless it has to be dropped.
+
+        Args:
+            name (str): The sound name, a key of the effects.
+
+        Returns:
+            Whether the sound was played.
+        """
+        category, priority, cooldown = self.effects[name]
+        now = self.game.frame
+        last = self._last.get(name)
+        if last is not None and now - last < cooldown:
+            self.dropped += 1
+            return False
+        voice = self._choose(self._voices[category], priority, now)
+        if voice is None:
+            self.dropped += 1
+            return False
+        if voice.ends > now:
+            self.stolen += 1
+        sound = getattr(self.game, f"{name}_sound")
+        if name not in self._lengths:
+            self._lengths[name] = math.ceil(sound.get_length() * settings.FPS)
+        if voice.channel:
+            voice.channel.play(sound)
+        voice.name = name
+        voice.priority = priority
+        voice.started = now
+        voice.ends = now + max(self._lengths[name], 1)
+        self._last[name] = now
+        self.played += 1
+        self.peak = max(self.peak, self.voices())
+        return True
+
+    @staticmethod
+    def _choose(voices, priority, now):
+        """Find a free voice or the one to steal, None if there is none."""
+        chosen = None
+        for voice in voices:
+            if voice.ends <= now:
+                return voice
+            if voice.priority <= priority and (
+                chosen is None
+                or (voice.priority, voice.started)
+                < (chosen.priority, chosen.started)
+            ):
+                chosen = voice
+        return chosen
+
+    def voices(self):
+        """Get how many voices are playing a sound."""
+        now = self.game.frame
+        return sum(
+            voice.ends > now
+            for voices in self._voices.values()
+            for voice in voices
+        )
+
+    def capacity(self):
+        """Get how many voices there are."""
+        return sum(len(voices) for voices in self._voices.values())
@@ -0,0 +1,14 @@
+"""Bake the spritesheet into a pre-scaled atlas and a binary index.
+
+$ python bake.py
+"""
+
+from os import path
+
+import settings
+from sprite.spritesheet import bake
+
+if __name__ == "__main__":
+    assets_path = path.join(path.dirname(__file__), "assets")
+    for file_name in bake(path.join(assets_path, settings.SPRITESHEET)):
+        print(f"wrote {file_name}")
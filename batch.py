@@ -0,0 +1,268 @@
+"""Play many seeded games at once to see how hard the stages are.
+
+Every run is a headless game played by controller.ClimbingController,
+spread over a pool of processes. The runs of each variant (the default
+settings, or settings changed with --variant) are summed up as how high
+the player got, what killed it and how long it took to clear a stage.
+
+    $ python batch.py --runs 200
+    $ python batch.py --levels other.csv --variant GRAVITY=0.9
+    $ python batch.py --variant PLAYER_ACC=0.6,PLAYER_STRENGTH=-22
+
+Each worker process starts one game and plays all its runs with it, so
+variants may only change the settings in VARIANT_SETTINGS, which are
+read while the game is played. Other settings, like WIDTH or HEIGHT, are
+read once when the game starts or are used to compute other settings,
+and are refused.
+"""
+
+import argparse
+import ast
+import json
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import settings
+from controller import ClimbingController
+from game import Game
+from level import LevelRepository
+
+# settings read while the game is played, the only ones a variant changes
+VARIANT_SETTINGS = frozenset(
+    [
+        "PLAYER_INI_POS",
+        "PLAYER_ACC",
+        "PLAYER_FRICTION",
+        "PLAYER_STRENGTH",
+        "GRAVITY",
+        "SPAWN_DISTANCE",
+        "ENDLESS",
+        "CHUNK_HEIGHT",
+        "STAGE_CHUNKS",
+        "PREFETCH_CHUNKS",
+        "PLATFORM_MIN_GAP",
+        "REACH_MARGIN",
+        "SPRING_SPAWN_PCT",
+        "MOB_FREQ",
+        "BOOST_POWER",
+        "BOOST_SPRING",
+        "POW_SPAWN_PCT",
+    ]
+)
+
+# the game of each worker process and its default stages, made by the
+# first run of the process
+_game = None
+_levels = None
+
+
+def play(job):
+    """Play one game, in a worker process.
+
+    Args:
+        job (dict): The run, with its seed, max_frames, overrides (a
+                    dictionary of settings values) and levels (a file
+                    name, or None for the default one).
+
+    Returns:
+        A dictionary like the one of Game.simulate.
+    """
+    global _game, _levels
+    if _game is None:
+        _game = Game(headless=True)
+        _levels = _game.levels
+    game = _game
+    original = {name: getattr(settings, name) for name in job["overrides"]}
+    for name, value in job["overrides"].items():
+        setattr(settings, name, value)
+    try:
+        game.levels = _levels
+        if job["levels"]:
+            game.levels = LevelRepository(job["levels"])
+        return game.simulate(
+            ClimbingController(), job["max_frames"], seed=job["seed"]
+        )
+    finally:
+        for name, value in original.items():
+            setattr(settings, name, value)
+
+
+def run_batch(
+    runs, seed=0, levels=None, overrides=None, max_frames=None, workers=None
+):
+    """Play seeded games across processes.
+
+    Args:
+        runs (int): How many games to play, seeded seed, seed + 1, ...
+        seed (int): Seed of the first game.
+        levels (str): Level (full path) file name, the default if omitted.
+        overrides (dict): Settings values to use instead of the defaults,
+                          only those in VARIANT_SETTINGS.
+        max_frames (int): Longest game, in updates.
+        workers (int): How many processes, one per CPU if omitted.
+
+    Returns:
+        A list with the result of each game, in seed order.
+    """
+    jobs = [
+        {
+            "seed": seed + number,
+            "levels": levels,
+            "overrides": overrides or {},
+            "max_frames": max_frames,
+        }
+        for number in range(runs)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(play, jobs))
+
+
+def percentile(values, rank):
+    """Get a percentile of some values.
+
+    Args:
+        values (list): Numbers, sorted.
+        rank (float): The percentile, from 0 to 1.
+    """
+    return values[min(int(len(values) * rank), len(values) - 1)]
+
+
+def summarize(results):
+    """Sum up the results of a batch.
+
+    Args:
+        results (list): Results as given by run_batch.
+
+    Returns:
+        A dictionary with the number of runs, the mean, median, p10 and
+        p90 of the height reached, the count of each death cause (None
+        for the players still alive), the fraction of runs clearing a
+        stage, the median seconds to the first clear and the mean score.
+    """
+    heights = sorted(result["height"] for result in results)
+    firsts = [
+        result["clears"][0] / settings.FPS
+        for result in results
+        if result["clears"]
+    ]
+    return {
+        "runs": len(results),
+        "height": {
+            "mean": statistics.mean(heights),
+            "median": statistics.median(heights),
+            "p10": percentile(heights, 0.1),
+            "p90": percentile(heights, 0.9),
+        },
+        "deaths": dict(Counter(result["death"] for result in results)),
+        "clear_rate": len(firsts) / len(results),
+        "first_clear": statistics.median(firsts) if firsts else None,
+        "score": statistics.mean(result["score"] for result in results),
+    }
+
+
+def parse_variant(text):
+    """Parse the settings of a variant, like GRAVITY=0.9,PLAYER_ACC=0.6.
+
+    Raises:
+        argparse.ArgumentTypeError: If a setting does not exist or is not
+                                    in VARIANT_SETTINGS.
+    """
+    overrides = {}
+    for pair in text.split(","):
+        name, _, value = pair.partition("=")
+        name = name.strip()
+        if not hasattr(settings, name):
+            raise argparse.ArgumentTypeError(f"unknown setting {name}")
+        if name not in VARIANT_SETTINGS:
+            raise argparse.ArgumentTypeError(
+                f"{name} is read when the game starts, a variant can not"
+                " change it"
+            )
+        try:
+            overrides[name] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            overrides[name] = value.strip()
+    return overrides
+
+
+def report(summaries):
+    """Print the summary of each variant."""
+    print(
+        f"{'variant':<32}{'runs':>6}{'height':>8}{'p10':>7}{'p90':>7}"
+        f"{'clear':>7}{'first':>7}  deaths"
+    )
+    for name, summary in summaries.items():
+        height = summary["height"]
+        first = summary["first_clear"]
+        first = "-" if first is None else f"{first:.1f}s"
+        deaths = ", ".join(
+            f"{cause or 'alive'} {count}"
+            for cause, count in sorted(
+                summary["deaths"].items(), key=lambda item: str(item[0])
+            )
+        )
+        print(
+            f"{name:<32}{summary['runs']:>6}{height['median']:>8.0f}"
+            f"{height['p10']:>7}{height['p90']:>7}"
+            f"{summary['clear_rate']:>7.0%}"
+            f"{first:>7}  {deaths}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--runs", type=int, default=100, help="games played per variant"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the first game"
+    )
+    parser.add_argument(
+        "--levels", metavar="FILE", help="platforms file, like platforms.csv"
+    )
+    parser.add_argument(
+        "--variant",
+        metavar="NAME=VALUE,...",
+        type=parse_variant,
+        action="append",
+        default=[],
+        help="settings to try besides the defaults, may be repeated",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=settings.FPS * 300,
+        help="longest game, in updates",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="processes, one per CPU by default"
+    )
+    parser.add_argument(
+        "--json", metavar="FILE", help="also write the summaries to a file"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    summaries = {}
+    for overrides in [{}] + args.variant:
+        name = ",".join(f"{k}={v}" for k, v in overrides.items()) or "default"
+        results = run_batch(
+            args.runs,
+            seed=args.seed,
+            levels=args.levels,
+            overrides=overrides,
+            max_frames=args.frames,
+            workers=args.workers,
+        )
+        summaries[name] = summarize(results)
+    report(summaries)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
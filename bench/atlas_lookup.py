@@ -0,0 +1,62 @@
+"""Micro-benchmark for spritesheet atlas lookups.
+
+Compares the old minidom linear scan against the parsed name index.
+
+    $ python -m bench.atlas_lookup
+"""
+
+import timeit
+from os import path
+from xml.dom import minidom
+
+import settings
+from sprite.spritesheet import parse_atlas
+
+ATLAS = path.join(
+    path.dirname(path.dirname(__file__)),
+    "assets",
+    settings.SPRITESHEET.replace(".png", ".xml"),
+)
+
+# names spread across the atlas, the last one sits at the very end
+NAMES = ["bronze_1.png", "carrot.png", "flyMan_fly.png", "wing_right.png"]
+
+
+def minidom_lookup(dom, image_name):
+    """The lookup performed by Spritesheet.get_info before the index."""
+    for node in dom.getElementsByTagName("SubTexture"):
+        if node.getAttribute("name") == image_name:
+            return tuple(
+                int(node.getAttribute(attr))
+                for attr in ("x", "y", "width", "height")
+            )
+    raise ValueError(f"{image_name} not found in spritesheet.")
+
+
+def main(number=2000):
+    dom = minidom.parse(ATLAS)
+    index = parse_atlas(ATLAS)
+    print(f"{len(index)} entries in {path.basename(ATLAS)}")
+
+    load_dom = min(timeit.repeat(lambda: minidom.parse(ATLAS), number=20))
+    load_idx = min(timeit.repeat(lambda: parse_atlas(ATLAS), number=20))
+    print(f"{'load':<16}{'minidom':>12}{'index':>12}")
+    print(
+        f"{'':<16}{load_dom / 20 * 1e3:>10.3f}ms{load_idx / 20 * 1e3:>10.3f}ms"
+    )
+
+    print(f"{'lookup':<16}{'minidom':>12}{'index':>12}")
+    for name in NAMES:
+        assert minidom_lookup(dom, name) == index[name]
+        scan = min(
+            timeit.repeat(lambda: minidom_lookup(dom, name), number=number)
+        )
+        hit = min(timeit.repeat(lambda: index[name], number=number))
+        print(
+            f"{name:<16}{scan / number * 1e6:>10.2f}us"
+            f"{hit / number * 1e6:>10.3f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
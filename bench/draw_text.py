@@ -0,0 +1,62 @@
+"""Per-frame cost of the score HUD at 60 FPS.
+
+Compares building a SysFont and rendering on every frame (the old
+Game.draw_text) against the font and text caches.
+
+    $ python -m bench.draw_text
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+import pygame.freetype  # noqa: E402
+
+import settings  # noqa: E402
+from game import Game  # noqa: E402
+
+
+def uncached(game, text, size, color, pos):
+    """The text drawing performed by Game.draw_text before the caches."""
+    font = pygame.freetype.SysFont(settings.FONT_NAME, size)
+    text_surface, text_rect = font.render(text, pygame.Color(*color))
+    text_rect.midtop = pos
+    game.screen.blit(text_surface, text_rect)
+
+
+def run(draw, frames):
+    """Draw the score for a number of frames, scoring every ten frames."""
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw(frame // 10)
+    return (time.perf_counter() - start) / frames * 1e3
+
+
+def main(frames=600):
+    game = Game()
+    # the game only initializes FreeType once it needs a font
+    pygame.freetype.init()
+    pos = (settings.WIDTH / 2, 15)
+    budget = 1000 / settings.FPS
+
+    def before(score):
+        uncached(game, f"Score: {score}", 18, settings.WHITE, pos)
+
+    def after(score):
+        game.player.score = score
+        game.draw_score()
+
+    game.player = SimpleNamespace(score=0)
+    print(f"{'':<10}{'per frame':>12}{'of budget':>12}")
+    for name, draw in (("uncached", before), ("cached", after)):
+        ms = run(draw, frames)
+        print(f"{name:<10}{ms:>10.3f}ms{ms / budget:>11.1%}")
+    print(f"text cache: {game.texts.info()}")
+
+
+if __name__ == "__main__":
+    main()
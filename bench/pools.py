@@ -0,0 +1,62 @@
+"""Allocations of a steady climb, with and without sprite pools.
+
+The player is kept flying up through the stages, so platforms and
+clouds are made and retired all the time and enemies come every few
+seconds.
+
+    $ python -m bench.pools
+"""
+
+import time
+
+import settings
+from controller import ScriptedController
+from game import Game
+from metrics import AllocationCounter
+
+
+def fly(game):
+    """Keep the player flying up, as if it had an endless jetpack,
+    and clear the stage as soon as all its platforms are built."""
+    game.player.vel.y = settings.BOOST_POWER / 4
+    if not game.streams:
+        game.stage_clear()
+    return 0
+
+
+def run(pools, warmup, updates):
+    """Climb for a while and count what the steady part allocated."""
+    game = Game(headless=True)
+    game.pool.enabled = pools
+    counter = AllocationCounter()
+    phases = [warmup, warmup + updates]
+
+    def script(game):
+        if game.frame == phases[0]:
+            counter.reset()
+            game.pool.made = game.pool.reused = 0
+            phases.append(time.perf_counter())
+        return fly(game)
+
+    game.simulate(ScriptedController(script), max_frames=phases[1], seed=1)
+    elapsed = time.perf_counter() - phases[2]
+    counter.close()
+    return game, counter, elapsed / updates * 1e6
+
+
+def main(warmup=3000, updates=6000):
+    print(
+        f"{'':<10}{'made':>8}{'reused':>8}{'gc 0/1/2':>14}"
+        f"{'blocks':>9}{'per update':>13}"
+    )
+    for name, pools in (("no pools", False), ("pools", True)):
+        game, counter, us = run(pools, warmup, updates)
+        collections = "/".join(str(c) for c in counter.collections)
+        print(
+            f"{name:<10}{game.pool.made:>8}{game.pool.reused:>8}"
+            f"{collections:>14}{counter.blocks():>9}{us:>11.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
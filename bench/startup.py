@@ -0,0 +1,69 @@
+"""Startup time and resident memory, with and without the baked atlas.
+
+Each mode runs in a fresh interpreter with dummy video and audio drivers.
+
+    $ python bake.py
+    $ python -m bench.startup
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+
+def measure(baked):
+    """Start a game and cut every sprite frame it uses."""
+    import settings
+
+    settings.BAKED_SPRITESHEET = baked
+    start = time.perf_counter()
+    from game import Game
+    from sprite.inanimate import Platform, Spring
+    from sprite.items import Carrot, Jetpack
+    from sprite.living import FlyMan, Player
+
+    game = Game()
+    loaded = time.perf_counter()
+    names = set(Spring.image_names + Player.image_names + FlyMan.image_names)
+    names.update([Carrot.image_name, Jetpack.image_name])
+    names.update(n for n in Platform.image_names if n in game.spritesheet.info)
+    for name in names:
+        game.spritesheet.get_image(name)
+    ready = time.perf_counter()
+    return {
+        "load_data": (loaded - start) * 1e3,
+        "frames": (ready - loaded) * 1e3,
+        "total": (ready - start) * 1e3,
+        "maxrss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main(runs=5):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    print(f"{'mode':<8}{'init':>10}{'frames':>10}{'total':>10}{'rss':>10}")
+    for mode in ("raw", "baked"):
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-m", "bench.startup", mode],
+                env=env,
+                check=True,
+                stdout=subprocess.PIPE,
+            ).stdout
+            samples.append(json.loads(out.splitlines()[-1]))
+        best = {k: min(s[k] for s in samples) for k in samples[0]}
+        print(
+            f"{mode:<8}{best['load_data']:>8.1f}ms{best['frames']:>8.1f}ms"
+            f"{best['total']:>8.1f}ms{best['maxrss']:>8.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print(json.dumps(measure(sys.argv[1] == "baked")))
+    else:
+        main()
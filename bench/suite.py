@@ -0,0 +1,195 @@
+"""Headless scenarios timing the game updates, checked against a baseline.
+
+Every scenario plays a seeded game without a window, as fast as
+possible, and reports the updates (ticks) per second, the time of each
+phase of the updates and what they allocated. The ticks per second are
+compared with bench/baseline.json, the run fails when any scenario got
+slower than the baseline by more than the tolerance.
+
+    $ python -m bench.suite
+    $ python -m bench.suite --update-baseline  # after a deliberate change
+"""
+
+import argparse
+import json
+import sys
+import time
+from os import path
+
+import settings
+from controller import ScriptedController
+from game import Game
+from metrics import AllocationCounter
+from profiler import FrameProfiler
+
+BASELINE = path.join(path.dirname(path.abspath(__file__)), "baseline.json")
+PHASES = ["update", "collision", "animation", "scroll", "spawn_enemies"]
+
+
+def idle(game):
+    """Stand still on the first platform of stage 1."""
+    return 0
+
+
+def jetpack(game):
+    """Fly up as if hitting a jetpack every second, clearing the stages
+    whose platforms are all built so there is always more to scroll."""
+    if game.frame % settings.FPS == 1:
+        game.player.boosted = True
+        game.player.vel.y = settings.BOOST_POWER
+    if not game.streams:
+        game.stage_clear()
+    return 0
+
+
+def stages(game):
+    """Climb steadily while clearing a stage every two seconds."""
+    game.player.vel.y = settings.BOOST_POWER / 4
+    if game.frame % (settings.FPS * 2) == 0:
+        game.stage_clear()
+    return 0
+
+
+def swarm(game, size=50):
+    """Stand still while keeping the upper half of the screen full
+    of FlyMen."""
+    while len(game.enemies) < size:
+        pos = (
+            game.rng.randrange(-100, settings.WIDTH + 100),
+            game.rng.randrange(settings.HEIGHT // 3) + game.camera.top(),
+        )
+        game.new_enemy(pos)
+    return 0
+
+
+SCENARIOS = {
+    "idle": idle,
+    "jetpack": jetpack,
+    "stages": stages,
+    "swarm": swarm,
+}
+
+
+def run(script, updates, seed=1):
+    """Play a scenario and measure it.
+
+    Args:
+        script (callable): Gives the commands of each update.
+        updates (int): How many updates to play.
+        seed (int): Seed of the game.
+
+    Returns:
+        A dictionary with the ticks per second, the p50 and p95 of each
+        phase (in milliseconds), the garbage collections, the memory
+        blocks left allocated and the sprites made (not reused).
+    """
+    game = Game(headless=True)
+    game.profiler = FrameProfiler(size=updates)
+    counter = AllocationCounter()
+    start = time.perf_counter()
+    game.simulate(ScriptedController(script), max_frames=updates, seed=seed)
+    elapsed = time.perf_counter() - start
+    counter.close()
+    stats = game.profiler.stats()
+    return {
+        "ticks": game.frame / elapsed,
+        "phases": {
+            name: [stats[name]["p50"], stats[name]["p95"]]
+            for name in PHASES
+            if name in stats
+        },
+        "gc": sum(counter.collections),
+        "blocks": counter.blocks(),
+        "made": game.pool.made,
+    }
+
+
+def measure(updates, repeat):
+    """Run every scenario, keeping the fastest of the repeated runs."""
+    results = {}
+    for name, script in SCENARIOS.items():
+        runs = [run(script, updates) for _ in range(repeat)]
+        results[name] = max(runs, key=lambda result: result["ticks"])
+    return results
+
+
+def report(results, baseline, tolerance):
+    """Print the results next to the baseline.
+
+    Returns:
+        The names of the scenarios slower than the baseline allows.
+    """
+    slower = []
+    print(
+        f"{'':<10}{'ticks/s':>10}{'baseline':>10}{'change':>9}"
+        f"{'gc':>5}{'blocks':>8}{'made':>6}"
+    )
+    for name, result in results.items():
+        before = baseline.get(name, {}).get("ticks")
+        change = ""
+        if before:
+            ratio = result["ticks"] / before - 1
+            change = f"{ratio:+.1%}"
+            if ratio < -tolerance:
+                slower.append(name)
+        print(
+            f"{name:<10}{result['ticks']:>10.0f}"
+            f"{before or 0:>10.0f}{change:>9}"
+            f"{result['gc']:>5}{result['blocks']:>8}{result['made']:>6}"
+        )
+    print()
+    print(f"{'ms p50/p95':<16}" + "".join(f"{name:>14}" for name in results))
+    for phase in PHASES:
+        cells = []
+        for result in results.values():
+            p50, p95 = result["phases"].get(phase, (0, 0))
+            cells.append(f"{p50:.3f}/{p95:.3f}")
+        print(f"{phase:<16}" + "".join(f"{cell:>14}" for cell in cells))
+    return slower
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--updates", type=int, default=3000, help="updates per scenario"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs per scenario"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="slow down allowed before failing, as a fraction",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store these results as the new baseline",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = measure(args.updates, args.repeat)
+    baseline = {}
+    if path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    slower = report(results, baseline, args.tolerance)
+    if args.update_baseline:
+        for result in results.values():
+            result["ticks"] = round(result["ticks"])
+            for times in result["phases"].values():
+                times[:] = [round(ms, 4) for ms in times]
+        with open(BASELINE, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nbaseline written to {BASELINE}")
+    elif slower:
+        print(f"\nslower than the baseline: {', '.join(slower)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
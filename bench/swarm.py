@@ -0,0 +1,46 @@
+"""Updates of a horde of FlyMen, moved one by one or as a swarm.
+
+The upper part of the screen is kept full of FlyMen while the player
+stands still. The swarm needs NumPy.
+
+    $ python -m bench.swarm
+"""
+
+import time
+from functools import partial
+
+import settings
+from bench.suite import swarm
+from controller import ScriptedController
+from game import Game
+from sprite.swarm import Swarm
+
+
+def run(arrays, size, updates):
+    """Keep a horde of a size for a while and time the updates."""
+    settings.SWARM = arrays
+    game = Game(headless=True)
+    start = time.perf_counter()
+    game.simulate(
+        ScriptedController(partial(swarm, size=size)),
+        max_frames=updates,
+        seed=1,
+    )
+    return (time.perf_counter() - start) / updates * 1e6
+
+
+def main(sizes=(1, 50, 200, 500), updates=1000):
+    if not Swarm.available():
+        # without it both columns would time the FlyMen one by one
+        print("skipped: the swarm needs NumPy, pipenv install numpy")
+        return
+    default = settings.SWARM
+    print(f"{'FlyMen':<10}{'one by one':>14}{'swarm':>14}")
+    for size in sizes:
+        times = [run(arrays, size, updates) for arrays in (False, True)]
+        print(f"{size:<10}" + "".join(f"{us:>12.1f}us" for us in times))
+    settings.SWARM = default
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """A bounded mapping that evicts the least recently used entry.
+
+    Attributes:
+        maxsize (int): How many entries the cache holds before evicting.
+        hits (int): How many lookups were answered from the cache.
+        misses (int): How many lookups had to build a new value.
+    """
+
+    def __init__(self, maxsize=128):
+        """
+        Args:
+            maxsize (int): How many entries the cache holds before evicting.
+        """
+        super(LRUCache, self).__init__()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, factory):
+        """Get the value stored under key, building it if necessary.
+
+        Args:
+            key (hashable): The cache key.
+            factory (callable): Called with no arguments on a miss,
+                                its return value is stored under key.
+
+        Returns:
+            The cached value.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = self._data[key] = factory()
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Get the cache counters.
+
+        Returns:
+            A dictionary with hits, misses, current size and maxsize.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,45 @@
+import settings
+
+
+class Camera(object):
+    """The part of the world shown on the screen.
+
+    Sprites live in world coordinates and are only moved to screen
+    coordinates when drawn. The Y axis grows downwards, so the camera
+    goes up as its y decreases.
+
+    Attributes:
+        y (float): World Y axis value at the top of the screen.
+    """
+
+    def __init__(self, y=0.0):
+        """
+        Args:
+            y (float): World Y axis value at the top of the screen.
+        """
+        super(Camera, self).__init__()
+        self.y = y
+
+    def move(self, amount):
+        """Move the camera down (or up, for a negative amount).
+
+        Args:
+            amount (float): How much pixels the camera moves.
+        """
+        self.y += amount
+
+    def top(self, parallax=1):
+        """Get the world Y axis value at the top of the screen.
+
+        Args:
+            parallax (float): How fast the layer moves with the camera.
+        """
+        return self.y * parallax
+
+    def bottom(self, parallax=1):
+        """Get the world Y axis value at the bottom of the screen.
+
+        Args:
+            parallax (float): How fast the layer moves with the camera.
+        """
+        return self.y * parallax + settings.HEIGHT
@@ -0,0 +1,254 @@
+import pygame
+
+import settings
+from level import LevelGenerator
+
+# player commands, combined as bits
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+CUT_JUMP = 8
+
+
+class KeyboardController(object):
+    """Read the player commands from the keyboard."""
+
+    def __init__(self):
+        super(KeyboardController, self).__init__()
+        self._pending = 0
+
+    def handle(self, event):
+        """Take note of a key event.
+
+        Args:
+            event (pygame.event.Event): A window or keyboard event.
+        """
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            self._pending |= JUMP
+        if event.type == pygame.KEYUP and event.key == pygame.K_SPACE:
+            self._pending |= CUT_JUMP
+
+    def read(self, game):
+        """Get the commands for the next update.
+
+        Args:
+            game (Game): A reference for the running game.
+
+        Returns:
+            The commands as an int of bits.
+        """
+        commands = self._pending
+        self._pending = 0
+        key = pygame.key.get_pressed()
+        if key[pygame.K_LEFT]:
+            commands |= LEFT
+        if key[pygame.K_RIGHT]:
+            commands |= RIGHT
+        return commands
+
+
+class ScriptedController(object):
+    """Feed the player commands from a script.
+
+    The script is either a sequence with the commands of each update,
+    the player stays still once it is over, or a callable that receives
+    the game and returns the commands of the next update.
+    """
+
+    def __init__(self, script):
+        """
+        Args:
+            script (list or callable): The commands to play.
+        """
+        super(ScriptedController, self).__init__()
+        self.script = script
+        self.index = 0
+
+    def handle(self, event):
+        """Ignore window and keyboard events."""
+
+    def read(self, game):
+        """Get the commands for the next update.
+
+        Args:
+            game (Game): A reference for the running game.
+
+        Returns:
+            The commands as an int of bits.
+        """
+        if callable(self.script):
+            return self.script(game)
+        index = self.index
+        self.index += 1
+        if index < len(self.script):
+            return self.script[index]
+        return 0
+
+
+class ClimbingController(object):
+    """A simple player for simulations, climbing as fast as it can.
+
+    It walks under the closest platform within a jump and jumps to it,
+    going for the items on its way, and sticks to its target until it
+    lands. Window and keyboard events are ignored.
+
+    Attributes:
+        margin (int): How far inside the edges of the target to land.
+        slack (int): How much longer the way the player is going may be
+                     than the other way around the screen before it
+                     turns back.
+    """
+
+    def __init__(self, margin=20, slack=40):
+        """
+        Args:
+            margin (int): How far inside the edges of the target to land.
+            slack (int): How much longer the way the player is going may
+                         be than the other way around the screen before
+                         it turns back.
+        """
+        super(ClimbingController, self).__init__()
+        self.margin = margin
+        self.slack = slack
+        self.height = LevelGenerator.jump_height()
+        self._target = None
+        self._runup = False
+        self._way = 0
+
+    def handle(self, event):
+        """Ignore window and keyboard events."""
+
+    def target(self, game):
+        """Find where to go next.
+
+        Returns:
+            A sprite, the lowest platform above the player within a jump,
+            or an item (or spring) nearby when there is no such platform,
+            None if there is nothing to go for. While boosted, flying
+            past the platforms, the highest platform below the top of
+            the flight.
+        """
+        player = game.player
+        bottom = player.rect.bottom
+        if player.boosted:
+            rise = min(player.vel.y, 0) ** 2 / (2 * settings.GRAVITY)
+            platforms = game.platforms.below(bottom - rise + 10)
+            if platforms:
+                return min(platforms, key=lambda platform: platform.rect.top)
+        platforms = [
+            platform
+            for platform in game.platforms.above(bottom - 10)
+            if platform.rect.top > bottom - self.height - 10
+        ]
+        if platforms:
+            return max(platforms, key=lambda platform: platform.rect.top)
+        things = game.items.near(player.rect) + game.springs.near(player.rect)
+        if things:
+            return min(
+                things, key=lambda s: abs(s.rect.centerx - player.pos.x)
+            )
+        return None
+
+    def read(self, game):
+        """Get the commands for the next update.
+
+        Args:
+            game (Game): A reference for the running game.
+
+        Returns:
+            The commands as an int of bits.
+        """
+        player = game.player
+        if not player.alive:
+            return 0
+        target = self._target
+        locked = player.jumping and not player.boosted
+        if not (locked and target and target.alive()):
+            new = self.target(game)
+            if new is not target:
+                self._runup = False
+                self._way = 0
+            target = self._target = new
+        if target is None:
+            return JUMP
+        # the player goes out of the screen before wrapping around
+        period = settings.WIDTH + player.rect.width
+        distance = self.distance(player.pos.x, target.rect, period)
+        toward = RIGHT if distance > 0 else LEFT if distance < 0 else 0
+        if target.rect.top >= player.rect.bottom - 10:
+            return toward
+
+        # jump when the target is within reach, otherwise take a run up
+        # from the other edge of the platform
+        gap = player.rect.bottom - target.rect.top
+        ground = self.ground(game)
+        if ground is None or abs(distance) < LevelGenerator.reach(gap):
+            self._runup = False
+            return toward | JUMP
+        left = player.pos.x < ground.rect.left + 5
+        right = player.pos.x > ground.rect.right - 5
+        if self._runup:
+            if (toward == RIGHT and left) or (toward == LEFT and right):
+                self._runup = False
+            return toward ^ (LEFT | RIGHT)
+        if (toward == RIGHT and right) or (toward == LEFT and left):
+            speed = player.vel.x if toward == RIGHT else -player.vel.x
+            if speed <= 3:
+                self._runup = True
+            elif (
+                player.pos.x > ground.rect.right + 4
+                if toward == RIGHT
+                else player.pos.x < ground.rect.left - 4
+            ):
+                # jump as late as possible, just before falling off
+                return toward | JUMP
+        return toward
+
+    def distance(self, x, rect, period=settings.WIDTH):
+        """Get how far a rect is from a point, to the sides.
+
+        Args:
+            x (float): X axis value of the point.
+            rect (pygame.Rect): The area of interest, the point is only
+                                close to it when self.margin inside it.
+            period (float): How far the point goes to get back where it
+                            was, around the screen.
+
+        Returns:
+            The distance in pixels, negative to the left, taking the
+            shortest way since the screen wraps around. The way taken is
+            kept until the target changes, unless the other one becomes
+            shorter by more than self.slack, so the player never stalls
+            turning back and forth when both ways are about as long.
+        """
+        distances = []
+        for shift in (-period, 0, period):
+            left = rect.left + shift + self.margin
+            right = rect.right + shift - self.margin
+            if left > right:
+                left = right = rect.centerx + shift
+            distances.append(min(max(x, left), right) - x)
+        distance = min(distances, key=abs)
+        if self._way:
+            kept = min(
+                (d for d in distances if d * self._way > 0),
+                key=abs,
+                default=None,
+            )
+            if kept is not None and abs(kept) <= abs(distance) + self.slack:
+                distance = kept
+        if distance:
+            self._way = 1 if distance > 0 else -1
+        return distance
+
+    def ground(self, game):
+        """Find the platform the player stands on, if any."""
+        player = game.player
+        for platform in game.platforms.near(player.rect):
+            if (
+                abs(platform.rect.top - player.pos.y) < 3
+                and platform.rect.left - 10 < player.pos.x
+                and player.pos.x < platform.rect.right + 10
+            ):
+                return platform
+        return None
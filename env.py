@@ -0,0 +1,262 @@
+"""Many headless games behind one reset/step API, for training players.
+
+    >>> env = VecEnv(8)
+    >>> observations = env.reset(seed=1)
+    >>> actions = numpy.full(8, controller.RIGHT | controller.JUMP)
+    >>> observations, rewards, dones, infos = env.step(actions)
+
+Needs NumPy, which the game itself does not. Only the observations,
+rewards and dones are arrays, each game still updates its own sprites
+one after another. The games share one display surface and one
+AssetManager, so their images are only loaded once.
+"""
+
+import random
+
+import pygame
+
+import settings
+from game import Game
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# values of each player in an observation
+PLAYER_VALUES = 5
+# values of each platform and enemy in an observation
+SPRITE_VALUES = 3
+
+
+class _Commands(object):
+    """A controller whose commands are set from the outside."""
+
+    def __init__(self):
+        super(_Commands, self).__init__()
+        self.commands = 0
+
+    def handle(self, event):
+        """Ignore window and keyboard events."""
+
+    def read(self, game):
+        """Get the commands set for the next update."""
+        return self.commands
+
+
+class VecEnv(object):
+    """Independent headless games, each updated once per step in turn.
+
+    Observations are read from the sprite rects, not from pixels. The
+    observation of each game is a row of floats:
+
+    - the player X axis value and height on the screen, as fractions
+      of the screen size, its speed, as fractions of the jump speed,
+      and 1 while jumping, 0 otherwise;
+    - for each of the platforms on the screen nearest to the player,
+      the distances from the player to the middle of its top, as
+      fractions of the screen size, and its width, as a fraction of
+      the screen width;
+    - the same for each of the enemies nearest to the player, except
+      the last value is always 1.
+
+    Missing platforms and enemies are all zeros. The reward of a step
+    is how much the score went up. A game is done when the player
+    dies or falls, or after max_steps steps, it then restarts on its
+    own and its info holds its results (as given by Game.simulate)
+    and its last observation.
+
+    Attributes:
+        size (int): How many games there are.
+        platforms (int): How many platforms each observation shows.
+        enemies (int): How many enemies each observation shows.
+        max_steps (int): Longest game, in steps, unlimited if None.
+        games (list): The games.
+        observation_size (int): How many values an observation has.
+    """
+
+    def __init__(self, size, platforms=5, enemies=2, max_steps=None):
+        """
+        Args:
+            size (int): How many games to step.
+            platforms (int): How many platforms each observation shows.
+            enemies (int): How many enemies each observation shows.
+            max_steps (int): Longest game, in steps, unlimited if None.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError(
+                "VecEnv needs NumPy, install it with: pipenv install numpy"
+            )
+        super(VecEnv, self).__init__()
+        self.size = size
+        self.platforms = platforms
+        self.enemies = enemies
+        self.max_steps = max_steps
+        self.observation_size = PLAYER_VALUES + SPRITE_VALUES * (
+            platforms + enemies
+        )
+        self._controllers = [_Commands() for _ in range(size)]
+        self.games = [Game(headless=True, controller=self._controllers[0])]
+        self.games += [
+            Game(
+                headless=True,
+                controller=controller,
+                assets=self.games[0].assets,
+            )
+            for controller in self._controllers[1:]
+        ]
+        self._scores = [0] * size
+        self._rng = random.Random()
+
+    def reset(self, seed=None):
+        """Restart every game.
+
+        Args:
+            seed (int): Seed of the first game, the others get the next
+                        numbers and later restarts are seeded from it.
+                        New seeds if omitted.
+
+        Returns:
+            The observations, an array with a row for each game.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self._rng.seed(seed)
+        for index in range(self.size):
+            self._restart(index, seed + index)
+        return self.observe()
+
+    def _restart(self, index, seed):
+        """Restart a game."""
+        game = self.games[index]
+        game.start(seed)
+        game.playing = True
+        self._scores[index] = 0
+
+    def step(self, actions):
+        """Update every game once.
+
+        Args:
+            actions (sequence): The commands of each game, as ints of
+                                controller.LEFT, RIGHT, JUMP and
+                                CUT_JUMP bits.
+
+        Returns:
+            Four values are returned (observations, rewards, dones,
+            infos), the first three are arrays with a row (or value)
+            for each game and infos is a list of dictionaries.
+        """
+        rewards = numpy.zeros(self.size, dtype=numpy.float32)
+        dones = numpy.zeros(self.size, dtype=bool)
+        infos = [{} for _ in range(self.size)]
+        for index, game in enumerate(self.games):
+            self._controllers[index].commands = int(actions[index])
+            game.update()
+            score = game.player.score
+            rewards[index] = score - self._scores[index]
+            self._scores[index] = score
+            truncated = bool(self.max_steps and game.frame >= self.max_steps)
+            if game.death or not game.playing or truncated:
+                dones[index] = True
+                infos[index] = {
+                    "seed": game.seed,
+                    "score": score,
+                    "stage": game.stage,
+                    "frames": game.frame,
+                    "height": game.height,
+                    "death": game.death,
+                    "clears": list(game.clears),
+                    "truncated": truncated and not game.death,
+                    "terminal_observation": self.observe_game(game),
+                }
+                self._restart(index, self._rng.getrandbits(32))
+        return self.observe(), rewards, dones, infos
+
+    def observe(self):
+        """Get the observations of every game.
+
+        Returns:
+            An array with a row for each game.
+        """
+        observations = numpy.zeros(
+            (self.size, self.observation_size), dtype=numpy.float32
+        )
+        for index, game in enumerate(self.games):
+            self.observe_game(game, observations[index])
+        return observations
+
+    def observe_game(self, game, out=None):
+        """Get the observation of a game.
+
+        Args:
+            game (Game): One of the games.
+            out (numpy.ndarray): Where to write the observation, a new
+                                 array if omitted.
+
+        Returns:
+            The observation, an array.
+        """
+        if out is None:
+            out = numpy.zeros(self.observation_size, dtype=numpy.float32)
+        else:
+            out[:] = 0
+        player = game.player
+        x, y = player.pos
+        speed = -settings.PLAYER_STRENGTH
+        out[:PLAYER_VALUES] = (
+            x / settings.WIDTH,
+            (y - game.camera.top()) / settings.HEIGHT,
+            player.vel.x / speed,
+            player.vel.y / speed,
+            player.jumping,
+        )
+        sprites = out[PLAYER_VALUES:].reshape(-1, SPRITE_VALUES)
+        view = pygame.Rect(
+            0, game.camera.top(), settings.WIDTH, settings.HEIGHT
+        )
+        platforms = game.platforms.near(view)
+        nearest = self.nearest(platforms, x, y, self.platforms)
+        for row, platform in enumerate(nearest):
+            rect = platform.rect
+            sprites[row] = (
+                (rect.centerx - x) / settings.WIDTH,
+                (rect.top - y) / settings.HEIGHT,
+                rect.width / settings.WIDTH,
+            )
+        nearest = self.nearest(game.enemies, x, y, self.enemies)
+        for row, enemy in enumerate(nearest, self.platforms):
+            rect = enemy.rect
+            sprites[row] = (
+                (rect.centerx - x) / settings.WIDTH,
+                (rect.centery - y) / settings.HEIGHT,
+                1,
+            )
+        return out
+
+    @staticmethod
+    def nearest(sprites, x, y, count):
+        """Get the sprites nearest to a point, the nearest first.
+
+        Args:
+            sprites (iterable): The sprites.
+            x (float): X axis value of the point.
+            y (float): Y axis value of the point.
+            count (int): How many sprites at most.
+        """
+
+        def distance(sprite):
+            rect = sprite.rect
+            return (rect.centerx - x) ** 2 + (rect.top - y) ** 2
+
+        return sorted(sprites, key=distance)[:count]
+
+    def close(self):
+        """Stop the level generators of the games and the loading of
+        their assets."""
+        for game in self.games:
+            if game.generator:
+                game.generator.close()
+        self.games[0].assets.close()
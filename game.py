@@ -1,74 +1,297 @@
-import csv
+import os
 import random
-from itertools import islice
 from os import path
 
 import pygame
-import pygame.freetype
 
 import settings
+from assets import AssetManager, Lazy
+from audio import Mixer
+from cache import LRUCache
+from camera import Camera
+from controller import CUT_JUMP, JUMP, KeyboardController
+from level import MATERIALS, LevelGenerator, LevelRepository, RowStream
+from profiler import FrameProfiler, NullProfiler
+from render import DirtyRenderer, Renderer
+from sprite.groups import GridGroup
 from sprite.inanimate import Cloud, Platform, Spring
 from sprite.items import Carrot, Jetpack
 from sprite.living import FlyMan, Player
+from sprite.pool import SpritePool
+from sprite.swarm import Swarm, SwarmFlyMan
 from sprite.spritesheet import Spritesheet
 
 
 class Game(object):
-    """Game dynamic and rules."""
-
-    def __init__(self):
+    """Game dynamic and rules.
+
+    Attributes:
+        headless (bool): Whether the game runs without window and sound,
+                         updating as fast as possible.
+        controller (object): Where the player commands come from.
+        commands (int): The player commands of the current update.
+        frame (int): How many updates the current game had.
+        previous_camera (float): Camera position before the last update.
+        seed (int): The seed of the current game.
+        rng (random.Random): Source of every random choice of the game.
+        camera (Camera): The part of the world shown on the screen.
+        generator (LevelGenerator): Where the stages after the ones of
+                                    the platforms file come from.
+        pool (SpritePool): Killed sprites waiting to be reused.
+        profiler (FrameProfiler): Times the phases of every frame, a
+                                  NullProfiler when profiling is off.
+        show_profile (bool): Whether the profiler overlay is shown.
+        streams (list): Rows of the loaded stages not built yet.
+        loaded (int): The last stage whose platforms were loaded.
+        live_sprites (int): How many sprites the last update handled.
+        mask_tests (int): How many enemy mask tests the last update ran.
+        height (int): How many pixels the view scrolled up in this game.
+        death (str): What killed the player, enemy or fall, if anything.
+        clears (list): The frame of every stage clear in this game.
+        assets (AssetManager): Loads the images and sounds.
+        mixer (Mixer): Plays the sound effects.
+        swarm (Swarm): Moves the enemies, None without NumPy or when
+                       settings.SWARM is off.
+        startup (StartupProfile): Times the startup, None when it is not.
+    """
+
+    # loaded in the background by load_data
+    spritesheet = Lazy()
+    cloud_images = Lazy()
+    platform_widths = Lazy()
+    jump_sound = Lazy()
+    powerup_sound = Lazy()
+    death_sound = Lazy()
+    show_spring_sound = Lazy()
+    spring_sound = Lazy()
+
+    def __init__(
+        self, headless=False, controller=None, startup=None, assets=None
+    ):
+        """
+        Args:
+            headless (bool): Run with dummy video and audio drivers and
+                             never wait for the clock or for keys.
+            controller (object): Where the player commands come from,
+                                 the keyboard if omitted.
+            startup (StartupProfile): Times the startup, if given.
+            assets (AssetManager): Loads the images and sounds, shared
+                                   with other games if given, a new one
+                                   if omitted.
+        """
         super(Game, self).__init__()
-        # pygame initialization
-        pygame.init()
-        pygame.mixer.init()
-        pygame.display.set_caption(settings.TITLE)
-        self.screen = pygame.display.set_mode(
-            (settings.WIDTH, settings.HEIGHT)
-        )
+        self.assets = AssetManager() if assets is None else assets
+        self.headless = headless
+        self.startup = startup
+        self.screen = self.init_pygame()
+        if startup:
+            startup.mark("pygame init")
+        self.mixer = Mixer(self)
         # define basic counters, controllers and sprite groups
         self.clock = pygame.time.Clock()
         self.running = True
         self.playing = False
         self.stage = 0
+        self.frame = 0
+        self.max_frames = None
+        self.controller = controller or KeyboardController()
+        self.commands = 0
+        self.previous_camera = 0.0
+        self.seed = None
+        self.rng = random.Random()
+        self.camera = Camera()
+        self.streams = []
+        self.loaded = 0
+        self.generator = None
+        self.generator_origin = 0
+        self.live_sprites = 0
+        self.mask_tests = 0
+        self.height = 0
+        self.death = None
+        self.clears = []
+        self.pool = SpritePool(settings.SPRITE_POOLS)
+        self.swarm = None
+        if settings.SWARM and Swarm.available():
+            self.swarm = Swarm(self)
+        if settings.PROFILE:
+            self.profiler = FrameProfiler()
+        else:
+            self.profiler = NullProfiler()
+        self.show_profile = False
+        self.profile_text = None
         self.sprites = pygame.sprite.LayeredUpdates()
-        self.platforms = pygame.sprite.Group()
-        self.springs = pygame.sprite.Group()
-        self.clouds = pygame.sprite.Group()
-        self.items = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
+        self.platforms = GridGroup()
+        self.springs = GridGroup()
+        self.clouds = GridGroup()
+        self.items = GridGroup()
+        self.enemies = GridGroup()
+        # fonts and rendered text are reused between frames
+        self.fonts = {}
+        self.texts = LRUCache(settings.TEXT_CACHE_SIZE)
+        self.score_text = None
+        if settings.DIRTY_RECTS:
+            self.renderer = DirtyRenderer(self)
+        else:
+            self.renderer = Renderer(self)
         # load external data
         self.load_data()
+        if startup:
+            startup.mark("load data")
+
+    def init_pygame(self):
+        """Initialize the pygame subsystems in use, the fonts on first use
+        and the sounds only when they can be heard.
+
+        Headless games pick the dummy drivers, unless others were chosen
+        in the environment, only while pygame starts, so the games made
+        later in the same process are not headless because of them. They
+        share the display surface already set by another game.
+
+        Returns:
+            The display surface.
+        """
+        chosen = []
+        screen = pygame.display.get_surface()
+        size = (settings.WIDTH, settings.HEIGHT)
+        if self.headless and screen is not None and screen.get_size() == size:
+            return screen
+        if self.headless:
+            for name in ("SDL_VIDEODRIVER", "SDL_AUDIODRIVER"):
+                if name not in os.environ:
+                    os.environ[name] = "dummy"
+                    chosen.append(name)
+        elif (
+            pygame.display.get_init()
+            and pygame.display.get_driver() == "dummy"
+            and "SDL_VIDEODRIVER" not in os.environ
+        ):
+            # a headless game picked the dummy driver, a window is wanted
+            pygame.display.quit()
+        try:
+            pygame.display.init()
+            if not self.headless:
+                pygame.mixer.init()
+            pygame.display.set_caption(settings.TITLE)
+            return pygame.display.set_mode(size)
+        finally:
+            for name in chosen:
+                del os.environ[name]
+
+    def new(self, seed=None):
+        """(Re)Start the game and play it.
+
+        Args:
+            seed (int): Seed of the random choices, a new one if omitted.
+        """
+        self.start(seed)
+        if not self.headless:
+            pygame.mixer.music.load(
+                path.join(self._snd_path, settings.SND_MAIN)
+            )
+            pygame.mixer.music.set_volume(1.0)
+        self.run()
+
+    def start(self, seed=None):
+        """(Re)Start the game without playing it, for stepping it through
+        update from the outside.
 
-    def new(self):
-        """(Re)Start the game."""
+        Args:
+            seed (int): Seed of the random choices, a new one if omitted.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng.seed(seed)
         self.new_highscore = 0
         self.enemies_timer = 0
+        self.frame = 0
+        self.height = 0
+        self.death = None
+        self.clears = []
+        self.camera = Camera()
+        self.streams = []
+        self.loaded = 0
+        if self.generator:
+            self.generator.close()
+        self.generator = None
         self.stage = 1
-        self.sprites.empty()
-        self.platforms.empty()
-        self.springs.empty()
-        self.clouds.empty()
-        self.items.empty()
-        self.enemies.empty()
+        self.mixer.reset()
+        # killed sprites go back to the pool for the next game
+        for sprite in self.sprites.sprites():
+            sprite.kill()
         self.update_scenario()
+        self.renderer.invalidate()
         self.player = Player.new(
             self, pos=settings.PLAYER_INI_POS, groups=[self.sprites]
         )
-        pygame.mixer.music.load(path.join(self._snd_path, settings.SND_MAIN))
-        pygame.mixer.music.set_volume(1.0)
-        self.run()
 
     def run(self):
         """Stage loop."""
-        pygame.mixer.music.play(loops=-1)
         self.playing = True
+        if self.headless:
+            while self.playing:
+                with self.profiler.phase("events"):
+                    self.events()
+                with self.profiler.phase("update"):
+                    self.update()
+                self.profiler.end_frame()
+                if self.max_frames and self.frame >= self.max_frames:
+                    self.playing = False
+            return
+        # the game is updated at settings.FPS no matter how often it is
+        # drawn, frames draw the sprites between their last two positions
+        step = 1000 / settings.FPS
+        lag = 0.0
+        pygame.mixer.music.play(loops=-1)
         while self.playing:
-            self.clock.tick(settings.FPS)
-            self.events()
-            self.update()
-            self.draw()
+            elapsed = self.clock.tick(settings.RENDER_FPS)
+            lag += min(elapsed, settings.MAX_FRAME_TIME)
+            with self.profiler.phase("events"):
+                self.events()
+            while lag >= step and self.playing:
+                with self.profiler.phase("update"):
+                    self.update()
+                lag -= step
+            with self.profiler.phase("draw"):
+                self.draw(lag / step if settings.INTERPOLATE else 1.0)
+            self.profiler.end_frame()
         pygame.mixer.music.fadeout(500)
 
+    def simulate(self, controller, max_frames=None, seed=None):
+        """Play a whole game in headless mode.
+
+        Args:
+            controller (object): Where the player commands come from.
+            max_frames (int): Stop the game after this many updates.
+            seed (int): Seed of the random choices, a new one if omitted.
+
+        Returns:
+            A dictionary with the final score, stage and frame count,
+            whether the player was still alive, how high the view went,
+            what killed the player and the frame of every stage clear.
+        """
+        self.controller = controller
+        self.max_frames = max_frames
+        self.new(seed)
+        return {
+            "seed": self.seed,
+            "score": self.player.score,
+            "stage": self.stage,
+            "frames": self.frame,
+            "alive": self.player.alive,
+            "height": self.height,
+            "death": self.death,
+            "clears": list(self.clears),
+        }
+
+    def get_ticks(self):
+        """Get the game time in milliseconds.
+
+        The time comes from the number of updates, as if every update
+        took exactly 1 / settings.FPS seconds, so replays are exact.
+        """
+        return self.frame * 1000 // settings.FPS
+
     def events(self):
         """Event handler.
         Decide which action perform based on window and keyboard events."""
@@ -82,77 +305,352 @@ class Game(object):
                     if self.playing:
                         self.playing = False
                     self.running = False
-                if event.key == pygame.K_SPACE:
-                    self.player.jump()
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_SPACE:
-                    self.player.cut_jump()
+                if event.key == pygame.K_F3:
+                    self.toggle_profile()
+            self.controller.handle(event)
 
     def update(self):
         """Update screen.
         Move sprites and/or create new when necessary."""
+        self.frame += 1
+        narrow_tests = self.enemies.narrow_tests
+        # the sprites that move keep their own previous positions
+        self.previous_camera = self.camera.y
+
+        # apply the player commands
+        self.commands = self.controller.read(self)
+        if self.commands & JUMP:
+            self.player.jump()
+        if self.commands & CUT_JUMP:
+            self.player.cut_jump()
 
         # call the update method of all sprites
         self.sprites.update()
+        if self.swarm is not None:
+            self.swarm.update()
 
         # maybe spawn a new enemy
-        self.spawn_enemies()
-
-    def draw(self):
-        """Put everything on screen."""
-        self.screen.fill(settings.STAGES_BGCOLOR[self.stage])
-        self.sprites.draw(self.screen)
-        score = {
-            "text": f"Score: {self.player.score}",
-            "size": 18,
-            "color": settings.WHITE,
-            "pos": (settings.WIDTH / 2, 15),
-        }
-        self.draw_text(**score)
-        pygame.display.flip()
+        with self.profiler.phase("spawn_enemies"):
+            self.spawn_enemies()
+
+        self.live_sprites = len(self.sprites)
+        self.mask_tests = self.enemies.narrow_tests - narrow_tests
+        # the group keeps the rects of removed sprites for its own draw
+        # method, which the renderers never call
+        del self.sprites.lostsprites[:]
+
+    def draw(self, alpha=1.0):
+        """Put everything on screen.
+
+        Args:
+            alpha (float): How far the time is from the previous update (0)
+                           to the last one (1).
+        """
+        self.renderer.draw(alpha)
+
+    def hud(self):
+        """Get what is drawn on top of the stage.
+
+        Returns:
+            A list of (surface, rect) tuples, the score and the profiler
+            overlay when it is shown.
+        """
+        _, text_surface, text_rect = self.score_surface()
+        hud = [(text_surface, text_rect)]
+        if self.show_profile:
+            hud.append(self.profile_surface())
+        return hud
+
+    def toggle_profile(self):
+        """Show or hide the profiler overlay, profiling from now on."""
+        if isinstance(self.profiler, NullProfiler):
+            self.profiler = FrameProfiler()
+        self.show_profile = not self.show_profile
+        self.profile_text = None
+        self.renderer.invalidate()
+
+    def profile_surface(self):
+        """Get the rendered profiler overlay.
+
+        The numbers are only rendered again every
+        settings.PROFILE_OVERLAY_INTERVAL frames.
+
+        Returns:
+            Two values are returned (surface, rect).
+        """
+        frames = self.profiler.frames
+        interval = settings.PROFILE_OVERLAY_INTERVAL
+        if self.profile_text and frames - self.profile_text[0] < interval:
+            return self.profile_text[1:]
+        font = self.get_font(12)
+        color = pygame.Color(*settings.WHITE)
+        rows = [["ms", "p50", "p95", "p99"]]
+        for name, stats in sorted(self.profiler.stats().items()):
+            rows.append([name] + [f"{stats[key]:.2f}" for key in rows[0][1:]])
+        cells = [[font.render(text, color)[0] for text in row] for row in rows]
+        # the phase names are aligned to the left and the numbers to the
+        # right, so the columns line up no matter the font
+        widths = [
+            max(row[i].get_width() for row in cells) + 8 for i in range(4)
+        ]
+        mixer = self.mixer
+        masks = self.spritesheet.mask_builds
+        lines = [
+            f"voices {mixer.voices()}/{mixer.capacity()}"
+            f"  peak {mixer.peak}  dropped {mixer.dropped}",
+            f"sprites {self.live_sprites}  mask tests {self.mask_tests}"
+            f"  masks built {masks.count} ({masks.per_second():.0f}/s)",
+        ]
+        if isinstance(self.renderer, DirtyRenderer):
+            lines.append(
+                f"dirty {self.renderer.fraction:.0%}"
+                f"  average {self.renderer.average_fraction():.0%}"
+                f"  full frames {self.renderer.full_frames}"
+            )
+        footer = [font.render(line, color)[0] for line in lines]
+        height = font.get_sized_height()
+        surface = pygame.Surface(
+            (
+                max([sum(widths)] + [f.get_width() + 4 for f in footer]) + 4,
+                height * (len(cells) + len(footer)) + 8,
+            ),
+            pygame.SRCALPHA,
+        )
+        surface.fill((0, 0, 0, 160))
+        for number, line in enumerate(footer, len(cells)):
+            surface.blit(line, (4, 4 + number * height))
+        for number, row in enumerate(cells):
+            y = 4 + number * height
+            surface.blit(row[0], (4, y))
+            right = widths[0]
+            for width, cell in zip(widths[1:], row[1:]):
+                right += width
+                surface.blit(cell, (right - cell.get_width(), y))
+        rect = surface.get_rect(topleft=(5, 40))
+        self.profile_text = (frames, surface, rect)
+        return surface, rect
+
+    def draw_score(self):
+        """Draw the score on top of the screen."""
+        _, text_surface, text_rect = self.score_surface()
+        self.screen.blit(text_surface, text_rect)
+
+    def score_surface(self):
+        """Get the rendered score.
+
+        The text is only rendered again when the score changes.
+
+        Returns:
+            Three values are returned (score, surface, rect).
+        """
+        score = self.player.score
+        if not self.score_text or self.score_text[0] != score:
+            text_surface, text_rect = self.render_text(
+                f"Score: {score}", 18, settings.WHITE
+            )
+            text_rect = text_rect.copy()
+            text_rect.midtop = (settings.WIDTH / 2, 15)
+            self.score_text = (score, text_surface, text_rect)
+        return self.score_text
 
     def draw_text(self, text, size, color, pos):
         """Draw text on screen."""
-        font = pygame.freetype.SysFont(settings.FONT_NAME, size)
-        text_surface, text_rect = font.render(text, pygame.Color(*color))
+        text_surface, text_rect = self.render_text(text, size, color)
+        text_rect = text_rect.copy()
         text_rect.midtop = pos
         self.screen.blit(text_surface, text_rect)
 
+    def get_font(self, size, name=settings.FONT_NAME):
+        """Get a system font, loading it only once per name and size.
+
+        Args:
+            size (int): Font size.
+            name (str): Font name.
+
+        Returns:
+            A pygame.freetype.Font instance.
+        """
+        key = (name, size)
+        if key not in self.fonts:
+            # imported and initialized here, fonts are not needed to start
+            import pygame.freetype
+
+            if not pygame.freetype.get_init():
+                pygame.freetype.init()
+            self.fonts[key] = pygame.freetype.SysFont(name, size)
+        return self.fonts[key]
+
+    def render_text(self, text, size, color):
+        """Render text, reusing the surfaces of recently rendered texts.
+
+        Args:
+            text (str): The text to render.
+            size (int): Font size.
+            color (tuple): RGB text color.
+
+        Returns:
+            Two values are returned (surface, rect), both are shared
+            with later calls and must not be modified.
+        """
+        return self.texts.get(
+            (text, size, tuple(color)),
+            lambda: self.get_font(size).render(text, pygame.Color(*color)),
+        )
+
+    def bgcolor(self):
+        """Get the background color of the current stage."""
+        return settings.STAGES_BGCOLOR[
+            self.stage % len(settings.STAGES_BGCOLOR)
+        ]
+
     def update_scenario(self):
-        """Create new platforms and add clouds."""
-        with open(self._specs_file, "r") as file:
-            reader = csv.reader(file)
-            start, stop = settings.SPEC_LINES[self.stage]
-            for img, x, y, item in islice(reader, start, stop):
-                x, y = int(x), int(y)
-                # build a new platform
-                self.build_platform(img, (x, y), item)
-                # generate ramdom clouds
-                for _ in range(random.randint(1, 3)):
-                    self.build_cloud(y)
+        """Load the platforms of the current stage, unless they were
+        loaded ahead.
+
+        Platforms are only built when the view gets close to them."""
+        if self.stage > self.loaded:
+            self.load_stage(self.stage)
+        self.stream_platforms()
+
+    def load_stage(self, stage):
+        """Start streaming the platforms of a stage.
+
+        Args:
+            stage (int): The stage number, starting from 1.
+
+        Returns:
+            Whether the stage was loaded, the first generated stage waits
+            for the platforms of the file to be built.
+        """
+        if stage <= len(self.levels) or not settings.ENDLESS:
+            rows = self.levels.rows(stage)
+            # rows are placed relative to the screen at the time of loading
+            origin = round(self.camera.y)
+        else:
+            if not self.generator:
+                if self.streams:
+                    return False
+                self.start_generator()
+            rows = self.generator.rows(stage - len(self.levels))
+            origin = self.generator_origin
+        self.loaded = stage
+        self.streams.append(RowStream(rows, origin, stage))
+        return True
+
+    def load_ahead(self):
+        """Load the generated stage after the last one loaded.
+
+        Called once all the loaded platforms are built, so the player
+        always has platforms ahead, even past a carrot it did not take.
+        The stages of the file wait for a stage clear, they are placed
+        from where the view is then.
+
+        Returns:
+            Whether a stage was loaded.
+        """
+        if not settings.ENDLESS or self.loaded < len(self.levels):
+            return False
+        if not self.generator:
+            self.start_generator()
+            # the last stage of the file is cleared by a carrot on its
+            # highest platform when it has none left
+            highest = self.platforms.highest()
+            carrots = (item for item in self.items if isinstance(item, Carrot))
+            if (
+                self.stage == len(self.levels)
+                and highest
+                and next(carrots, None) is None
+            ):
+                carrot = Carrot.new(
+                    self, platform=highest, groups=[self.sprites, self.items]
+                )
+                carrot.stage = self.stage
+        return self.load_stage(self.loaded + 1)
+
+    def start_generator(self):
+        """Start making the generated stages, climbing from the highest
+        platform, in the background."""
+        x, origin = self.summit()
+        self.generator = LevelGenerator(
+            self.seed, self.platform_widths, start=x
+        )
+        self.generator_origin = origin
+        self.generator.prefetch(0)
+
+    def summit(self):
+        """Find the highest platform.
+
+        Returns:
+            Two values are returned (x, y), the X axis value of its
+            center and the Y axis value of its top.
+        """
+        highest = self.platforms.highest()
+        if highest:
+            return highest.rect.centerx, highest.rect.top
+        return settings.WIDTH / 2, self.camera.bottom()
+
+    def stream_platforms(self):
+        """Create new platforms and add clouds.
+
+        Build the platforms of the loaded stages that are less than
+        settings.SPAWN_DISTANCE pixels above the screen, loading the
+        generated stages ahead as they run out. Rows are expected to be
+        sorted from the bottom to the top."""
+        limit = self.camera.top() - settings.SPAWN_DISTANCE
+        while True:
+            for stream in self.streams:
+                while stream.peek():
+                    img, x, y, item = stream.peek()
+                    y += stream.origin
+                    if y < limit:
+                        break
+                    stream.pop()
+                    # build a new platform
+                    self.build_platform(img, (x, y), item, stream.stage)
+                    # generate ramdom clouds
+                    for _ in range(self.rng.randint(1, 3)):
+                        self.build_cloud(y - self.camera.top())
+            self.streams = [s for s in self.streams if s.peek()]
+            if self.streams or not self.load_ahead():
+                break
 
     def spawn_enemies(self):
         """Spawn a new enemy every ~5sec."""
-        now = pygame.time.get_ticks()
+        now = self.get_ticks()
         elapsed = now - self.enemies_timer
-        variation = random.choice([-1000, -500, 0, 500, 1000])
+        variation = self.rng.choice([-1000, -500, 0, 500, 1000])
         frequency = settings.MOB_FREQ + variation
         if elapsed > frequency:
             self.enemies_timer = now
             pos = (
-                random.choice([-100, settings.WIDTH + 100]),
-                random.randrange(settings.HEIGHT / 2),
+                self.rng.choice([-100, settings.WIDTH + 100]),
+                self.rng.randrange(settings.HEIGHT // 2)
+                + round(self.camera.top()),
             )
-            groups = [self.sprites, self.enemies]
-            FlyMan.new(self, pos=pos, groups=groups)
+            self.new_enemy(pos)
+
+    def new_enemy(self, pos):
+        """Make a FlyMan, moved by the swarm when there is one.
+
+        Args:
+            pos (tuple): X and Y axis positions where it will be draw.
 
-    def build_platform(self, img, pos, item=None):
+        Returns:
+            The FlyMan.
+        """
+        groups = [self.sprites, self.enemies]
+        if self.swarm is not None:
+            return SwarmFlyMan.new(self, pos=pos, groups=groups)
+        return FlyMan.new(self, pos=pos, groups=groups)
+
+    def build_platform(self, img, pos, item=None, stage=None):
         """Build a new platform.
 
         Args:
             img (str): A platform image name.
             pos (tuple): X and Y axis positions.
             item (str): The name of the item to be put on the platform.
+            stage (int): The stage of the platform, cleared by its carrot.
         """
         plat_groups = [self.sprites, self.platforms]
         plat = Platform.new(self, img, pos=pos, groups=plat_groups)
@@ -161,7 +659,9 @@ class Game(object):
             group = self.springs if item == "spring" else self.items
             item_groups = [self.sprites, group]
             item_clss = items[item]
-            item_clss.new(self, platform=plat, groups=item_groups)
+            sprite = item_clss.new(self, platform=plat, groups=item_groups)
+            if item == "carrot":
+                sprite.stage = stage
 
     def build_cloud(self, pos_y=None):
         """Build a new cloud.
@@ -169,76 +669,102 @@ class Game(object):
         The new cloud will have a random size and position.
 
         Args:
-            pos_y (int): A Y axis value just for reference.
+            pos_y (int): A Y axis value on the screen just for reference.
                          The cloud will be around this area.
         """
         if not pos_y:
             # 67 is the default height of the cloud
-            pos_y = random.randrange(settings.HEIGHT - 67)
+            pos_y = self.rng.randrange(settings.HEIGHT - 67)
         # 130 is the default width of the cloud
         pos = (
-            random.randrange(settings.WIDTH - 130),
-            pos_y - random.randrange(-100, 100),
+            self.rng.randrange(settings.WIDTH - 130),
+            pos_y
+            - self.rng.randrange(-100, 100)
+            + round(self.camera.top(Cloud.parallax)),
         )
 
         groups = [self.sprites, self.clouds]
-        Cloud.new(self.cloud_image, pos=pos, groups=groups)
+        Cloud.new(self, pos=pos, groups=groups)
 
     def scroll(self, amount):
-        """Simulate window scrolling by moving everything but the player down.
-        Also adding new platforms and clouds if necessary.
+        """Simulate window scrolling by moving the camera up.
+        Also scoring the platforms left behind, adding new platforms
+        and clouds and removing the ones off the screen if necessary.
 
         Args:
-            amount (int): How much pixels the screen will scroll down.
+            amount (float): How much pixels the screen will scroll down.
         """
-        for cloud in self.clouds:
-            cloud.rect.y += max(amount // 3, 1)
-        for enemy in self.enemies:
-            enemy.rect.y += amount
-        for platform in self.platforms:
-            platform.rect.y += amount
-            if platform.rect.top >= settings.HEIGHT:
-                self.player.score += 1
-
-    def stage_clear(self):
+        self.camera.move(-amount)
+        self.height = max(self.height, round(-self.camera.y))
+        self.renderer.invalidate()
+        for platform in self.platforms.below(self.camera.bottom()):
+            self.player.score += 1
+            platform.kill()
+        # clouds go as far as two screens below before being removed
+        bottom = self.camera.bottom(Cloud.parallax) + settings.HEIGHT
+        for cloud in self.clouds.below(bottom):
+            cloud.kill()
+        self.stream_platforms()
+
+    def stage_clear(self, stage=None):
         """Stage clear.
 
         Adds to the highest platform a spring to jump
         to the next stage, and loads the next stage
-        platforms and items.
+        platforms and items, unless they were loaded ahead.
+
+        Args:
+            stage (int): The stage cleared, the current one if omitted.
+                         It may be a later one, when the player went past
+                         carrots without taking them.
         """
-        platforms = self.platforms.sprites()
-        if len(platforms):
-            highest_platform = platforms[0]
-            for plat in platforms:
-                if plat.rect.y < highest_platform.rect.y:
-                    highest_platform = plat
+        if stage is None or stage < self.stage:
+            stage = self.stage
+        # the highest platform may not be built yet, but the highest of a
+        # stage loaded ahead holds its carrot
+        ahead = stage < self.loaded
+        stream = self.streams[-1] if self.streams else None
+        if ahead or not (stream and stream.put_on_highest("spring")):
+            highest_platform = self.platforms.highest()
+            if not highest_platform:
+                return
             groups = [self.sprites, self.springs]
             Spring.new(self, platform=highest_platform, groups=groups)
-            self.show_spring_sound.play()
-            self.stage += 1
-            self.update_scenario()
+        self.mixer.play("show_spring")
+        self.clears.append(self.frame)
+        self.stage = stage + 1
+        self.update_scenario()
 
     def over(self):
         """End the game.
 
         Move platforms up till they get off the screen and be destroyed.
         Verify is the highscore was beaten and go to the game over screen."""
-        for sprite in self.sprites:
-            sprite.rect.y -= max(self.player.vel.y, 10)
-            if sprite.rect.bottom < 0:
+        if not self.death:
+            self.death = "fall"
+        self.renderer.invalidate()
+        # the camera follows the falling player
+        amount = max(self.player.vel.y, 10)
+        self.camera.move(amount)
+        self.player.pos.y += amount
+        for group in (self.platforms, self.springs, self.items, self.enemies):
+            for sprite in group.above(self.camera.top()):
                 sprite.kill()
+        for cloud in self.clouds.above(self.camera.top(Cloud.parallax)):
+            cloud.kill()
         if len(self.platforms) == 0:
             self.playing = False
             if self.player.score > self.highscore:
                 self.new_highscore = self.player.score
                 self.highscore = self.new_highscore
-                self.save_highscore()
-            self.over_screen()
+                if not self.headless:
+                    self.save_highscore()
+            if not self.headless:
+                self.over_screen()
 
     def splash_screen(self):
         """Show splash screen."""
-        self.screen.fill(settings.STAGES_BGCOLOR[self.stage])
+        self.screen.fill(self.bgcolor())
         text = [
             {
                 "text": f"High score: {self.highscore}",
@@ -274,15 +800,22 @@ class Game(object):
         for txt in text:
             self.draw_text(**txt)
         pygame.display.flip()
-        pygame.mixer.music.load(path.join(self._snd_path, settings.SND_INTRO))
-        pygame.mixer.music.set_volume(0.3)
-        pygame.mixer.music.play(loops=-1)
+        self.assets.frame_shown()
+        if self.startup:
+            self.startup.mark("first flip")
+        intro = self.assets.music(
+            path.join(self._snd_path, settings.SND_INTRO)
+        )
+        if intro:
+            pygame.mixer.music.load(intro)
+            pygame.mixer.music.set_volume(0.3)
+            pygame.mixer.music.play(loops=-1)
         self.wait_for_key()
         pygame.mixer.music.fadeout(500)
 
     def over_screen(self):
         """Show game over screen."""
-        self.screen.fill(settings.STAGES_BGCOLOR[self.stage])
+        self.screen.fill(self.bgcolor())
         text = [
             {
                 "text": "GAME OVER",
@@ -322,6 +855,8 @@ class Game(object):
 
     def wait_for_key(self):
         """Wait for any key to be pressed or the window to be closed."""
+        if self.headless:
+            return
         while True:
             self.clock.tick(settings.FPS)
             for event in pygame.event.get():
@@ -343,48 +878,83 @@ class Game(object):
         except Exception:
             self.highscore = 0
 
-        # load spritesheet
+        # images and sounds are loaded in the background, in the order
+        # they are needed, and got on first use
         assets_path = path.join(cur_dir, "assets")
-        self.spritesheet = Spritesheet(
-            path.join(assets_path, settings.SPRITESHEET)
+        self.assets.load(
+            "spritesheet",
+            Spritesheet.load,
+            path.join(assets_path, settings.SPRITESHEET),
+            settings.BAKED_SPRITESHEET,
         )
+        self.assets.load(
+            "cloud_images",
+            self.load_cloud_images,
+            path.join(assets_path, Cloud.image_name),
+        )
+        self.assets.load("platform_widths", self.load_platform_widths)
+
+        # index the stages of the platforms file
+        self.levels = LevelRepository(
+            path.join(cur_dir, settings.PLATFORMS_FILE)
+        )
+
+        # load audio files
+        self._snd_path = path.join(cur_dir, "media")
+        sounds = [
+            ("jump_sound", settings.SND_JUMP),
+            ("powerup_sound", settings.SND_POW),
+            ("death_sound", settings.SND_DEATH),
+            ("show_spring_sound", settings.SND_SHOW_SPRING),
+            ("spring_sound", settings.SND_SPRING),
+        ]
+        for name, file_name in sounds:
+            self.assets.sound(
+                name, path.join(self._snd_path, file_name), volume=0.3
+            )
+
+    @staticmethod
+    def load_cloud_images(file_name):
+        """Load the cloud image in every size clouds are drawn at.
+
+        Args:
+            file_name (str): Cloud image (full path) file name.
 
-        # load cloud image
-        cloud_image = pygame.image.load(
-            path.join(assets_path, Cloud.image_name)
-        ).convert()
+        Returns:
+            A list of images, one for each of settings.CLOUD_SCALES.
+        """
+        cloud_image = pygame.image.load(file_name).convert()
         cloud_image = pygame.transform.scale(
             cloud_image,
             (cloud_image.get_width() // 2, cloud_image.get_height() // 2),
         )
         cloud_image.set_colorkey(settings.BLACK)
-        self.cloud_image = cloud_image
+        # clouds come in a few sizes, all scaled here once
+        cloud_images = []
+        for scale in settings.CLOUD_SCALES:
+            size = (
+                int(cloud_image.get_width() * scale),
+                int(cloud_image.get_height() * scale),
+            )
+            cloud_images.append(pygame.transform.scale(cloud_image, size))
+        return cloud_images
 
-        # save platforms file path
-        self._specs_file = path.join(cur_dir, settings.PLATFORMS_FILE)
+    def load_platform_widths(self):
+        """Get the widths of the platforms of the generated stages.
 
-        # load audio files
-        self._snd_path = path.join(cur_dir, "media")
-        self.jump_sound = pygame.mixer.Sound(
-            path.join(self._snd_path, settings.SND_JUMP)
-        )
-        self.jump_sound.set_volume(0.3)
-        self.powerup_sound = pygame.mixer.Sound(
-            path.join(self._snd_path, settings.SND_POW)
-        )
-        self.powerup_sound.set_volume(0.3)
-        self.death_sound = pygame.mixer.Sound(
-            path.join(self._snd_path, settings.SND_DEATH)
-        )
-        self.death_sound.set_volume(0.3)
-        self.show_spring_sound = pygame.mixer.Sound(
-            path.join(self._snd_path, settings.SND_SHOW_SPRING)
-        )
-        self.show_spring_sound.set_volume(0.3)
-        self.spring_sound = pygame.mixer.Sound(
-            path.join(self._snd_path, settings.SND_SPRING)
-        )
-        self.spring_sound.set_volume(0.3)
+        Returns:
+            A dictionary mapping image names to widths in pixels.
+        """
+        # loaded in the background, after the spritesheet, and the game
+        # attribute is only got on the main thread
+        spritesheet = self.assets.result("spritesheet")
+        widths = {}
+        for kind in MATERIALS:
+            for size in ("", "_small"):
+                image_name = f"ground_{kind}{size}.png"
+                image = spritesheet.get_image(image_name)
+                widths[image_name] = image.get_width()
+        return widths
 
     def save_highscore(self):
         """Save highscore to an external file."""
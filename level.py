@@ -0,0 +1,364 @@
+import math
+import mmap
+import random
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+import settings
+
+# ground materials of the generated stages, in order
+MATERIALS = ["grass", "snow", "wood", "cake", "stone", "sand"]
+
+
+class LevelRepository(object):
+    """Stages of platforms described in a CSV file.
+
+    Every row holds a platform image name, its X and Y axis positions and
+    an optional item. Stages are separated by blank lines, the first stage
+    is number 1.
+
+    The file is scanned once to find where each stage starts. Its rows are
+    only parsed, straight from a memory map of the file, while the rows of
+    a stage are iterated, so long files never sit in memory as objects.
+
+    Attributes:
+        file_name (str): Level (full path) file name.
+    """
+
+    def __init__(self, file_name):
+        """
+        Args:
+            file_name (str): Level (full path) file name.
+        """
+        super(LevelRepository, self).__init__()
+        self.file_name = file_name
+        self._starts = array("Q")  # byte offset of the first row
+        self._sizes = array("L")  # rows in the stage
+        self._data = b""
+        if path.getsize(file_name):
+            with open(file_name, "rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._scan()
+
+    def __len__(self):
+        """Get how many stages there are."""
+        return len(self._starts)
+
+    def _scan(self):
+        """Find where every stage starts and how many rows it has."""
+        separated = True
+        for offset, line in self._lines(0):
+            if not line:
+                separated = True
+                continue
+            if separated:
+                separated = False
+                self._starts.append(offset)
+                self._sizes.append(0)
+            self._sizes[-1] += 1
+
+    def _lines(self, offset):
+        """Iterate over the lines of the file.
+
+        Args:
+            offset (int): Byte offset where to start reading.
+
+        Yields:
+            Two values (offset, line), line is stripped bytes, empty for
+            blank lines.
+        """
+        data = self._data
+        while offset < len(data):
+            end = data.find(b"\n", offset)
+            if end < 0:
+                end = len(data)
+            yield offset, data[offset:end].strip()
+            offset = end + 1
+
+    def rows(self, stage):
+        """Iterate over the rows of a stage.
+
+        Args:
+            stage (int): The stage number, starting from 1.
+
+        Yields:
+            Four values (image_name, x, y, item), item may be empty.
+        """
+        if not 1 <= stage <= len(self):
+            return
+        import csv  # only needed once the stages are played
+
+        lines = self._lines(self._starts[stage - 1])
+        reader = csv.reader(line.decode() for _, line in lines)
+        for _ in range(self._sizes[stage - 1]):
+            image_name, x, y, item = next(reader)
+            yield image_name, int(x), int(y), item
+
+
+class RowStream(object):
+    """The rows of a stage waiting for their platforms to be built.
+
+    Rows go from the bottom to the top, so the last one is the highest.
+    The row after the next one is read ahead, to know which is the last.
+
+    Attributes:
+        origin (int): How much the view had scrolled when the stage loaded.
+        stage (int): The stage of the rows.
+    """
+
+    def __init__(self, rows, origin, stage=None):
+        """
+        Args:
+            rows (iterable): Rows as given by LevelRepository.rows.
+            origin (int): How much the view had scrolled when the stage
+                          was loaded.
+            stage (int): The stage of the rows.
+        """
+        super(RowStream, self).__init__()
+        self.origin = origin
+        self.stage = stage
+        self._rows = iter(rows)
+        self._head = None
+        self._after = next(self._rows, None)
+        self._last_item = None
+
+    def peek(self):
+        """Get the next row without taking it, None if there are no more."""
+        if self._head is None and self._after is not None:
+            self._head, self._after = self._after, next(self._rows, None)
+            if self._after is None and self._last_item is not None:
+                self._head = self._head[:3] + (self._last_item,)
+        return self._head
+
+    def pop(self):
+        """Take the next row, None if there are no more."""
+        row = self.peek()
+        self._head = None
+        return row
+
+    def put_on_highest(self, item):
+        """Replace the item of the highest row still waiting, the last one,
+        when it is read.
+
+        Args:
+            item (str): The name of the item.
+
+        Returns:
+            Whether there was any row waiting.
+        """
+        if self.peek() is None:
+            return False
+        if self._after is None:
+            self._head = self._head[:3] + (item,)
+        else:
+            self._last_item = item
+        return True
+
+
+class LevelGenerator(object):
+    """Endless stages of platforms made up as the game goes.
+
+    The world above the start is cut in chunks of settings.CHUNK_HEIGHT
+    pixels, each one made from its own random generator seeded with the
+    game seed and the chunk number, so chunks can be made in any order,
+    in a background thread, and still be the same for the same seed.
+
+    Every chunk starts with an anchor platform, whose position only
+    depends on the chunk seed, and climbs to the anchor of the next
+    chunk. The gaps between platforms are kept within what a jump can
+    reach, given settings.PLAYER_STRENGTH, settings.GRAVITY and
+    settings.PLAYER_ACC, so every platform can be reached without items.
+
+    Rows are given just like LevelRepository.rows, with the Y axis
+    values relative to the start. A stage is settings.STAGE_CHUNKS
+    chunks of the same material, its last platform holds a carrot.
+
+    Attributes:
+        seed (int): Seed of the generated platforms.
+        widths (dict): Width in pixels of each platform image.
+        start (float): X axis value of the center of the platform
+                       where the generated stages start.
+    """
+
+    def __init__(self, seed, widths, start=None):
+        """
+        Args:
+            seed (int): Seed of the generated platforms.
+            widths (dict): Width in pixels of each platform image name.
+            start (float): X axis value of the center of the platform
+                           where the generated stages start, the middle
+                           of the screen if omitted.
+        """
+        super(LevelGenerator, self).__init__()
+        self.seed = seed
+        self.widths = widths
+        self.start = settings.WIDTH / 2 if start is None else start
+        self._margin = max(widths.values()) / 2
+        self._futures = {}
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    @staticmethod
+    def jump_height():
+        """Get how high the player can jump, in pixels."""
+        return settings.PLAYER_STRENGTH**2 / (2 * settings.GRAVITY)
+
+    @classmethod
+    def max_gap(cls):
+        """Get the highest gap allowed between two platforms."""
+        return cls.jump_height() * settings.REACH_MARGIN
+
+    @staticmethod
+    def reach(gap):
+        """Get how far to the sides the player can get in a jump.
+
+        Args:
+            gap (float): How much higher the landing platform is.
+
+        Returns:
+            A distance in pixels, considering the player walks at its
+            top speed from the start and only lands while falling.
+        """
+        speed = -settings.PLAYER_STRENGTH
+        # frames until falling back to the height of the landing platform
+        frames = (
+            speed + math.sqrt(max(speed**2 - 2 * settings.GRAVITY * gap, 0))
+        ) / settings.GRAVITY
+        top_speed = settings.PLAYER_ACC / -settings.PLAYER_FRICTION
+        return top_speed * frames * settings.REACH_MARGIN
+
+    def _random(self, index):
+        """Get the random generator of a chunk."""
+        return random.Random(f"{self.seed}:{index}")
+
+    def anchor(self, index):
+        """Get the X axis value of the center of the anchor of a chunk.
+
+        Args:
+            index (int): The chunk number, starting from 0.
+        """
+        if index == 0:
+            return self.start
+        rng = self._random(index)
+        return rng.uniform(self._margin, settings.WIDTH - self._margin)
+
+    def make_chunk(self, index):
+        """Make the platforms of a chunk.
+
+        Args:
+            index (int): The chunk number, starting from 0.
+
+        Returns:
+            A list of rows (image_name, x, y, item), from the bottom to
+            the top. Only the X axis values of the platform centers are
+            known, the image name tells the width to the stage.
+        """
+        rng = self._random(index)
+        rng.random()  # the anchor position
+        height = settings.CHUNK_HEIGHT
+        fewest = math.ceil(height / self.max_gap())
+        most = max(int(height // settings.PLATFORM_MIN_GAP), fewest)
+        count = rng.randint(fewest, most)
+        step = height / count
+        jitter = min(step - settings.PLATFORM_MIN_GAP, self.max_gap() - step)
+        jitter = max(jitter, 0) / 2
+
+        # heights of the anchor, the platforms between and the next anchor
+        bottom = -index * height
+        heights = [bottom]
+        for number in range(1, count):
+            heights.append(
+                bottom - number * step + rng.uniform(-1, 1) * jitter
+            )
+        heights.append(bottom - height)
+        reaches = [
+            self.reach(heights[number] - heights[number + 1])
+            for number in range(count)
+        ]
+
+        # walk towards the next anchor without leaving the reach of it
+        target = self.anchor(index + 1)
+        centers = [self.anchor(index)]
+        for number in range(1, count):
+            left = sum(reaches[number:])
+            low = max(
+                centers[-1] - reaches[number - 1], target - left, self._margin
+            )
+            high = min(
+                centers[-1] + reaches[number - 1],
+                target + left,
+                settings.WIDTH - self._margin,
+            )
+            centers.append(rng.uniform(low, high))
+
+        rows = []
+        for number, (center, y) in enumerate(zip(centers, heights)):
+            item = ""
+            if number and rng.randrange(100) < settings.POW_SPAWN_PCT:
+                item = "jetpack"
+            elif number and rng.randrange(100) < settings.SPRING_SPAWN_PCT:
+                item = "spring"
+            size = rng.choice(["", "_small"])
+            rows.append((size, center, round(y), item))
+        return rows
+
+    def prefetch(self, first, count=None):
+        """Make chunks ahead of time in a background thread.
+
+        Args:
+            first (int): Number of the first chunk.
+            count (int): How many chunks to make,
+                         settings.PREFETCH_CHUNKS if omitted.
+        """
+        if count is None:
+            count = settings.PREFETCH_CHUNKS
+        for index in range(first, first + count):
+            if index not in self._futures:
+                future = self._executor.submit(self.make_chunk, index)
+                self._futures[index] = future
+
+    def chunk(self, index):
+        """Get the platforms of a chunk, made now if not made ahead.
+
+        Args:
+            index (int): The chunk number, starting from 0.
+
+        Returns:
+            The rows of the chunk, see make_chunk.
+        """
+        future = self._futures.pop(index, None)
+        if future is None:
+            return self.make_chunk(index)
+        return future.result()
+
+    def rows(self, stage):
+        """Iterate over the rows of a generated stage.
+
+        The platforms of the stage after the next chunk are made in
+        the background while the rows of a chunk are read.
+
+        Args:
+            stage (int): The generated stage number, starting from 1.
+
+        Yields:
+            Four values (image_name, x, y, item), item may be empty.
+        """
+        kind = MATERIALS[(stage - 1) % len(MATERIALS)]
+        first = (stage - 1) * settings.STAGE_CHUNKS
+        last = first + settings.STAGE_CHUNKS - 1
+        for index in range(first, last + 1):
+            self.prefetch(index + 1)
+            rows = self.chunk(index)
+            if index == 0:
+                rows = rows[1:]  # the anchor was not made here
+            for number, (size, center, y, item) in enumerate(rows):
+                if index == last and number == len(rows) - 1:
+                    item = "carrot"
+                image_name = f"ground_{kind}{size}.png"
+                x = round(center - self.widths[image_name] / 2)
+                yield image_name, x, y, item
+
+    def close(self):
+        """Stop making chunks in the background."""
+        self._executor.shutdown(wait=False)
+        self._futures.clear()
@@ -1,7 +1,85 @@
-from game import Game
+import argparse
+import time
+
+from startup import StartupProfile
+
+STARTED = time.perf_counter()
+
+
+def seed(value):
+    """Parse a seed, only the ones a replay file can hold are taken."""
+    number = int(value)
+    # replay.MAX_SEED, replay is only imported after the arguments
+    if not 0 <= number < 2**64:
+        raise argparse.ArgumentTypeError(
+            f"{value} is not between 0 and 2**64 - 1"
+        )
+    return number
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="A platform game.")
+    parser.add_argument(
+        "--seed", type=seed, help="seed of the random choices of the game"
+    )
+    parser.add_argument(
+        "--record", metavar="FILE", help="record the last game played"
+    )
+    parser.add_argument(
+        "--replay", metavar="FILE", help="replay a recorded game headlessly"
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="print how long the imports, initialization, assets and "
+        "first frame took",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="time every frame and write the stats to a .json or .csv file",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    demo = Game()
-    demo.splash_screen()
-    while demo.running:
-        demo.new()
+    args = parse_args()
+    startup = None
+    if args.startup_profile:
+        startup = StartupProfile(STARTED)
+        startup.mark("arguments")
+        startup.imports.install()
+    # the game is imported only now, so the imports can be timed
+    import replay
+    from game import Game
+    from profiler import FrameProfiler
+
+    if startup:
+        startup.imports.uninstall()
+        startup.mark("imports")
+    if args.replay:
+        game = Game(headless=True)
+        if args.profile:
+            game.profiler = FrameProfiler()
+        print(replay.play(game, args.replay))
+        if args.profile:
+            game.profiler.dump(args.profile)
+    else:
+        demo = Game(startup=startup)
+        if args.profile:
+            demo.profiler = FrameProfiler()
+        demo.splash_screen()
+        if startup:
+            print("\n".join(startup.report()))
+            print()
+            print("\n".join(demo.assets.report()))
+        while demo.running:
+            if args.record:
+                demo.controller = replay.Recorder(demo.controller)
+            demo.new(args.seed)
+            if args.record:
+                demo.controller.save(args.record, demo.seed)
+                demo.controller = demo.controller.controller
+        if args.profile:
+            demo.profiler.dump(args.profile)
+            print("\n".join(demo.assets.report()))
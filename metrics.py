@@ -0,0 +1,73 @@
+import gc
+import sys
+import time
+
+
+class RateCounter(object):
+    """Count events and tell how often they happen.
+
+    Attributes:
+        count (int): How many events happened so far.
+        rate (float): Events per second measured by the last per_second call.
+    """
+
+    def __init__(self):
+        super(RateCounter, self).__init__()
+        self.count = 0
+        self.rate = 0.0
+        self._last_count = 0
+        self._last_time = time.perf_counter()
+
+    def add(self, amount=1):
+        """Count events.
+
+        Args:
+            amount (int): How many events happened.
+        """
+        self.count += amount
+
+    def per_second(self):
+        """Get how many events happened per second since the last call."""
+        now = time.perf_counter()
+        elapsed = now - self._last_time
+        if elapsed > 0:
+            self.rate = (self.count - self._last_count) / elapsed
+            self._last_count = self.count
+            self._last_time = now
+        return self.rate
+
+
+class AllocationCounter(object):
+    """Count garbage collections and memory blocks in use.
+
+    A steady game should neither grow the number of allocated blocks
+    nor trigger many collections, since most garbage collections are
+    triggered by allocations.
+
+    Attributes:
+        collections (list): Collections of each generation so far.
+    """
+
+    def __init__(self):
+        super(AllocationCounter, self).__init__()
+        self.collections = [0] * len(gc.get_count())
+        self._blocks = sys.getallocatedblocks()
+        gc.callbacks.append(self._collected)
+
+    def _collected(self, phase, info):
+        if phase == "start":
+            self.collections[info["generation"]] += 1
+
+    def blocks(self):
+        """Get how many memory blocks were allocated and not freed."""
+        return sys.getallocatedblocks() - self._blocks
+
+    def reset(self):
+        """Start counting again from now."""
+        self.collections = [0] * len(self.collections)
+        self._blocks = sys.getallocatedblocks()
+
+    def close(self):
+        """Stop counting collections."""
+        if self._collected in gc.callbacks:
+            gc.callbacks.remove(self._collected)
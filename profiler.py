@@ -0,0 +1,153 @@
+import json
+import time
+from array import array
+from os import path
+
+import settings
+
+
+class _Phase(object):
+    """Context manager adding the time spent inside it to a phase."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.profiler.current[self.name] += elapsed
+
+
+class FrameProfiler(object):
+    """Time the phases of every frame.
+
+    The time spent in each phase is added up over a frame (a phase may
+    run more than once, like the updates of a slow frame) and kept in a
+    ring buffer with the last samples of that phase. Phases may be
+    nested, the time of the outer one includes the inner ones.
+
+    Attributes:
+        size (int): How many frames are kept for each phase.
+        frames (int): How many frames were profiled.
+        current (dict): Seconds spent in each phase in the current frame.
+    """
+
+    def __init__(self, size=settings.PROFILE_SAMPLES):
+        """
+        Args:
+            size (int): How many frames are kept for each phase.
+        """
+        super(FrameProfiler, self).__init__()
+        self.size = size
+        self.frames = 0
+        self.current = {}
+        self._phases = {}
+        self._samples = {}
+        self._last = time.perf_counter()
+
+    def phase(self, name):
+        """Get a context manager timing a phase of the frame.
+
+        Args:
+            name (str): The phase name.
+        """
+        context = self._phases.get(name)
+        if context is None:
+            context = self._phases[name] = _Phase(self, name)
+            self.current[name] = 0.0
+            self._samples[name] = array("d", bytes(8 * self.size))
+        return context
+
+    def end_frame(self):
+        """Keep the times of the current frame and start the next one.
+
+        The whole frame, from the previous call to this one, is kept as
+        the frame phase.
+        """
+        now = time.perf_counter()
+        self.phase("frame")
+        self.current["frame"] = now - self._last
+        self._last = now
+        index = self.frames % self.size
+        for name, elapsed in self.current.items():
+            self._samples[name][index] = elapsed
+            self.current[name] = 0.0
+        self.frames += 1
+
+    def stats(self):
+        """Get the percentiles of every phase over the kept frames.
+
+        Returns:
+            A dictionary mapping the phase names to dictionaries with
+            the p50, p95, p99 and max times, in milliseconds.
+        """
+        count = min(self.frames, self.size)
+        result = {}
+        for name, samples in self._samples.items():
+            values = sorted(samples[:count])
+            if not values:
+                continue
+            result[name] = {
+                key: values[min(int(count * rank), count - 1)] * 1e3
+                for key, rank in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+            }
+            result[name]["max"] = values[-1] * 1e3
+        return result
+
+    def dump(self, file_name):
+        """Write the percentiles of every phase to a file.
+
+        Args:
+            file_name (str): A .json file name, any other is written as CSV.
+        """
+        stats = self.stats()
+        with open(file_name, "w", newline="") as f:
+            if path.splitext(file_name)[1].lower() == ".json":
+                json.dump(
+                    {"frames": self.frames, "phases": stats}, f, indent=2
+                )
+                return
+            import csv  # only needed to write the stats
+
+            writer = csv.writer(f)
+            writer.writerow(["phase", "p50", "p95", "p99", "max"])
+            for name, values in stats.items():
+                writer.writerow(
+                    [name] + [f"{values[key]:.3f}" for key in values]
+                )
+
+
+class _NullPhase(object):
+    """Context manager doing nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class NullProfiler(object):
+    """A profiler that does not measure anything, for when it is off."""
+
+    frames = 0
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        """Get a context manager that does nothing."""
+        return self._phase
+
+    def end_frame(self):
+        """Do nothing."""
+
+    def stats(self):
+        """Get no stats at all."""
+        return {}
+
+    def dump(self, file_name):
+        """Write nothing."""
@@ -0,0 +1,217 @@
+import pygame
+
+import settings
+
+
+class Renderer(object):
+    """Draw the stage by repainting the whole screen every frame.
+
+    Sprites are drawn between the positions they had before and after
+    the last update, according to how much time passed since it.
+    """
+
+    def __init__(self, game):
+        """
+        Args:
+            game (Game): A reference for the running game.
+        """
+        super(Renderer, self).__init__()
+        self.game = game
+
+    def invalidate(self):
+        """Make the next frame repaint the whole screen."""
+
+    def place(self, sprite, alpha):
+        """Get where a sprite is drawn on the screen.
+
+        Sprites live in world coordinates, the camera offset (scaled by
+        the sprite parallax, if any) is only applied here.
+
+        Args:
+            sprite (pygame.sprite.Sprite): A sprite of the game.
+            alpha (float): How far the time is from the previous update (0)
+                           to the last one (1).
+
+        Returns:
+            A pygame.Rect with the sprite position on the screen.
+        """
+        return self._place(sprite, self.camera(alpha), alpha)
+
+    def camera(self, alpha):
+        """Get the camera position a frame is drawn from.
+
+        Args:
+            alpha (float): How far the time is from the previous update (0)
+                           to the last one (1).
+        """
+        game = self.game
+        camera = game.camera.y
+        if alpha < 1:
+            camera += (game.previous_camera - camera) * (1 - alpha)
+        return camera
+
+    def _place(self, sprite, camera, alpha):
+        """Get where a sprite is drawn, see place, from a camera position."""
+        rect = sprite.rect
+        offset = round(camera * getattr(sprite, "parallax", 1))
+        previous = getattr(sprite, "previous", None)
+        if previous is None or alpha >= 1:
+            return rect.move(0, -offset)
+        dx = rect.x - previous[0]
+        dy = rect.y - previous[1]
+        # sprites wrapping around the screen are not interpolated
+        if abs(dx) > settings.WIDTH / 2 or abs(dy) > settings.HEIGHT / 2:
+            return rect.move(0, -offset)
+        return rect.move(
+            round(dx * (alpha - 1)), round(dy * (alpha - 1)) - offset
+        )
+
+    def places(self, sprites, alpha):
+        """Get where some sprites are drawn on the screen.
+
+        Args:
+            sprites (list): Sprites of the game.
+            alpha (float): How far the time is from the previous update (0)
+                           to the last one (1).
+
+        Returns:
+            A list of (image, rect) tuples, one for each sprite.
+        """
+        camera = self.camera(alpha)
+        place = self._place
+        return [
+            (sprite.image, place(sprite, camera, alpha)) for sprite in sprites
+        ]
+
+    def draw(self, alpha=1.0):
+        """Put everything on screen.
+
+        Args:
+            alpha (float): How far the time is from the previous update (0)
+                           to the last one (1).
+        """
+        game = self.game
+        self.repaint(self.places(game.sprites.sprites(), alpha), game.hud())
+
+    def repaint(self, places, hud):
+        """Paint the whole screen.
+
+        Args:
+            places (list): The sprites, as given by places.
+            hud (list): What is drawn on top, as given by Game.hud.
+        """
+        game = self.game
+        game.screen.fill(game.bgcolor())
+        game.screen.blits(places, doreturn=False)
+        game.screen.blits(hud, doreturn=False)
+        with game.profiler.phase("flip"):
+            pygame.display.flip()
+
+
+class DirtyRenderer(Renderer):
+    """Draw the stage by repainting only the areas that changed.
+
+    Every sprite whose rect or image changed since the last frame marks
+    its old and new rects as dirty, those areas are painted with the
+    background, the sprites are drawn and only the dirty areas are sent
+    to the display. Frames where the camera moves repaint everything,
+    without looking for what changed.
+
+    Attributes:
+        fraction (float): Fraction of the screen updated in the last frame.
+        frames (int): How many frames were drawn.
+        full_frames (int): How many of them repainted the whole screen.
+    """
+
+    def __init__(self, game):
+        """
+        Args:
+            game (Game): A reference for the running game.
+        """
+        super(DirtyRenderer, self).__init__(game)
+        self.area = settings.WIDTH * settings.HEIGHT
+        self.bounds = pygame.Rect(0, 0, settings.WIDTH, settings.HEIGHT)
+        self.fraction = 1.0
+        self.frames = 0
+        self.full_frames = 0
+        self._fractions = 0.0
+        self._states = {}
+        self._drawn = ([], [])
+        self._bgcolor = None
+        self._hud = []
+        self._full = True
+
+    def invalidate(self):
+        """Make the next frame repaint the whole screen."""
+        self._full = True
+
+    def average_fraction(self):
+        """Get the average fraction of the screen updated per frame."""
+        return self._fractions / self.frames if self.frames else 0.0
+
+    def draw(self, alpha=1.0):
+        """Put everything on screen.
+
+        Args:
+            alpha (float): How far the time is from the previous update (0)
+                           to the last one (1).
+        """
+        game = self.game
+        bgcolor = game.bgcolor()
+        if bgcolor != self._bgcolor:
+            self._bgcolor = bgcolor
+            self._full = True
+
+        sprites = game.sprites.sprites()
+        places = self.places(sprites, alpha)
+        hud = game.hud()
+        self.frames += 1
+        if self._full:
+            self._full = False
+            self.full_frames += 1
+            self.fraction = 1.0
+            self._fractions += 1.0
+            self.repaint(places, hud)
+            # what was drawn only becomes states if the next frame is not
+            # a full one too, frames keep scrolling while climbing
+            self._states = None
+            self._drawn = (sprites, places)
+            self._hud = hud
+            return
+
+        # collect the areas covered by sprites that moved or changed
+        previous = self._states
+        if previous is None:
+            previous = dict(zip(*self._drawn))
+            self._drawn = ([], [])
+        dirty = []
+        states = {}
+        for sprite, place in zip(sprites, places):
+            state = previous.pop(sprite, None)
+            if state is None:
+                dirty.append(place[1])
+            elif state[1] != place[1] or state[0] is not place[0]:
+                dirty.append(state[1])
+                dirty.append(place[1])
+            states[sprite] = place
+        # and the areas left behind by sprites that were removed
+        dirty.extend(state[1] for state in previous.values())
+        self._states = states
+
+        # every sprite is drawn again on top of the areas that did not
+        # change, so the score and overlays must be repainted over them
+        # every frame, along with where they were in the last one
+        dirty.extend(rect for _, rect in self._hud)
+        dirty.extend(rect for _, rect in hud)
+        self._hud = hud
+
+        dirty = [self.bounds.clip(rect) for rect in dirty]
+        for rect in dirty:
+            game.screen.fill(bgcolor, rect)
+        game.screen.blits(places, doreturn=False)
+        game.screen.blits(hud, doreturn=False)
+        with game.profiler.phase("flip"):
+            pygame.display.update(dirty)
+        pixels = sum(rect.w * rect.h for rect in dirty)
+        self.fraction = min(pixels / self.area, 1.0)
+        self._fractions += self.fraction
@@ -0,0 +1,120 @@
+import struct
+
+from controller import ScriptedController
+
+# a header followed by the commands of each update, two updates per byte
+MAGIC = b"BJRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHQI")  # magic, version, seed, updates
+MAX_SEED = 2**64 - 1  # seeds are stored unsigned
+
+
+class Recorder(object):
+    """Record the commands another controller gives to the game.
+
+    Attributes:
+        controller (object): The controller being recorded.
+        commands (bytearray): The commands of each update so far.
+    """
+
+    def __init__(self, controller):
+        """
+        Args:
+            controller (object): The controller being recorded.
+        """
+        super(Recorder, self).__init__()
+        self.controller = controller
+        self.commands = bytearray()
+
+    def handle(self, event):
+        """Pass a window or keyboard event on to the recorded controller."""
+        self.controller.handle(event)
+
+    def read(self, game):
+        """Get the commands for the next update and record them.
+
+        Args:
+            game (Game): A reference for the running game.
+
+        Returns:
+            The commands as an int of bits.
+        """
+        commands = self.controller.read(game)
+        self.commands.append(commands)
+        return commands
+
+    def save(self, file_name, seed):
+        """Write the recording to a file.
+
+        Args:
+            file_name (str): Replay (full path) file name.
+            seed (int): The seed of the recorded game.
+        """
+        save(file_name, seed, self.commands)
+
+
+def save(file_name, seed, commands):
+    """Write a replay file.
+
+    Args:
+        file_name (str): Replay (full path) file name.
+        seed (int): The seed of the recorded game.
+        commands (bytes): The commands of each update, 4 bits each.
+
+    Raises:
+        ValueError: If the seed is negative or above MAX_SEED.
+    """
+    if not 0 <= seed <= MAX_SEED:
+        raise ValueError(f"A replay can not hold the seed {seed}.")
+    packed = bytearray((len(commands) + 1) // 2)
+    for index, bits in enumerate(commands):
+        packed[index // 2] |= (bits & 0x0F) << (4 * (index % 2))
+    with open(file_name, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, seed, len(commands)))
+        f.write(packed)
+
+
+def load(file_name):
+    """Read a replay file.
+
+    Args:
+        file_name (str): Replay (full path) file name.
+
+    Returns:
+        Two values are returned (seed, commands).
+        seed (int): The seed of the recorded game.
+        commands (bytearray): The commands of each update.
+
+    Raises:
+        ValueError: If the file is not a replay or is cut short.
+    """
+    with open(file_name, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{file_name} is not a replay.")
+    magic, version, seed, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{file_name} is not a replay.")
+    offset = HEADER.size
+    if len(data) < offset + (count + 1) // 2:
+        raise ValueError(f"{file_name} is cut short.")
+    commands = bytearray(count)
+    for index in range(count):
+        byte = data[offset + index // 2]
+        commands[index] = (byte >> (4 * (index % 2))) & 0x0F
+    return seed, commands
+
+
+def play(game, file_name):
+    """Play a replay file as fast as possible.
+
+    Args:
+        game (Game): A game created in headless mode.
+        file_name (str): Replay (full path) file name.
+
+    Returns:
+        The result of Game.simulate.
+    """
+    seed, commands = load(file_name)
+    controller = ScriptedController(commands)
+    return game.simulate(controller, max_frames=len(commands), seed=seed)
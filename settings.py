@@ -1,16 +1,31 @@
 # general
 TITLE = "Bunny Jumpy"
 FONT_NAME = "arial"
+TEXT_CACHE_SIZE = 32
 
 # screen and sprites
-FPS = 60
+FPS = 60  # game updates per second
+RENDER_FPS = 60  # frames drawn per second, independent from the updates
+MAX_FRAME_TIME = 250  # milliseconds, longer frames slow the game down
+INTERPOLATE = True  # draw sprites between their last two positions
 WIDTH = 480
 HEIGHT = 640
 TILE_SIZE = 32
+GRID_CELL_SIZE = 64  # rows of the collision grid
+DIRTY_RECTS = False  # repaint only the areas that changed
+SPRITE_SCALE = 0.4
+SPRITE_CACHE_SIZE = 64
+SPRITE_POOLS = True  # reuse killed sprites instead of making new ones
+
+# frame profiler, its overlay is toggled with F3
+PROFILE = False
+PROFILE_SAMPLES = 600  # frames kept to compute the percentiles
+PROFILE_OVERLAY_INTERVAL = 30  # frames between overlay refreshes
 
 # external files
 SCORE_FILE = ".highestscore"
 SPRITESHEET = "spritesheet.png"
+BAKED_SPRITESHEET = True  # use the output of bake.py when up to date
 PLATFORMS_FILE = "platforms.csv"
 SND_INTRO = "yippee.wav"
 SND_MAIN = "happytune.mp3"
@@ -20,6 +35,18 @@ SND_DEATH = "death.wav"
 SND_SHOW_SPRING = "showspring.wav"
 SND_SPRING = "spring.wav"
 
+# sound effects: category, priority (a voice is only taken from a sound of
+# the same or lower priority) and cooldown in updates between two plays
+SOUND_EFFECTS = {
+    "jump": ("player", 1, 6),
+    "powerup": ("items", 2, 10),
+    "spring": ("items", 2, 10),
+    "show_spring": ("items", 3, 30),
+    "death": ("alerts", 4, 60),
+}
+# mixer channels reserved for each category
+SOUND_CHANNELS = {"player": 1, "items": 2, "alerts": 1}
+
 # player properties
 PLAYER_INI_POS = (55, HEIGHT * 3 / 4)
 PLAYER_ACC = 0.5
@@ -27,8 +54,21 @@ PLAYER_FRICTION = -0.12
 PLAYER_STRENGTH = -20
 GRAVITY = 0.8
 
+# platforms are built when they get this close to the top of the screen
+SPAWN_DISTANCE = HEIGHT
+
+# generated stages, made up once the platforms file is over
+ENDLESS = True
+CHUNK_HEIGHT = HEIGHT  # platforms are generated this many pixels at a time
+STAGE_CHUNKS = 8
+PREFETCH_CHUNKS = 2  # chunks generated ahead, in the background
+PLATFORM_MIN_GAP = 90
+REACH_MARGIN = 0.75  # fraction of the jump reach used by the gaps
+SPRING_SPAWN_PCT = 2
+
 # enemy properties
 MOB_FREQ = 5000
+SWARM = False  # move the enemies in NumPy arrays (if installed), for hordes
 
 # items properties
 BOOST_POWER = -60
@@ -42,8 +82,9 @@ PLATFORM_LAYER = 1
 ITEMS_LAYER = 1
 CLOUD_LAYER = 0
 
-# platforms
-SPEC_LINES = (None, (0, 25), (25, 28))
+# clouds move slower than the camera, giving a sense of depth
+CLOUD_PARALLAX = 1 / 3
+CLOUD_SCALES = [0.3, 0.45, 0.6, 0.8, 1.0]  # sizes clouds are drawn at
 
 # colors
 BLACK = (0, 0, 0)
@@ -0,0 +1,194 @@
+from bisect import bisect_left, insort
+
+import pygame
+
+import settings
+
+
+class GridGroup(pygame.sprite.Group):
+    """A sprite group that buckets its sprites by rows of the world.
+
+    Collision queries only look at the rows around the sprite being
+    tested instead of every sprite in the group, and the sorted row
+    numbers find the sprites above or below a line without looking at
+    the others.
+
+    Sprites join their groups before setting their rects, so new sprites
+    are only put in rows by the next query. Sprites that move on their
+    own must call move after changing their rect. Small changes (less
+    than a row) are tolerated, since queries also look at the
+    neighbouring rows.
+
+    Attributes:
+        cell_size (int): Height in pixels of each row.
+        narrow_tests (int): How many collision tests (like mask tests)
+                            ran, besides the rect tests.
+    """
+
+    def __init__(self, *sprites, cell_size=settings.GRID_CELL_SIZE):
+        """
+        Args:
+            sprites (pygame.sprite.Sprite): Sprites to add to the group.
+            cell_size (int): Height in pixels of each row.
+        """
+        self.cell_size = cell_size
+        self.narrow_tests = 0
+        self._rows = {}
+        self._keys = []
+        self._spans = {}
+        self._pending = {}
+        super(GridGroup, self).__init__(*sprites)
+
+    def add_internal(self, sprite, *args):
+        super(GridGroup, self).add_internal(sprite, *args)
+        self._pending[sprite] = None
+
+    def remove_internal(self, sprite):
+        super(GridGroup, self).remove_internal(sprite)
+        if sprite in self._pending:
+            del self._pending[sprite]
+        else:
+            self._discard(sprite)
+
+    def _flush(self):
+        """Put the sprites added since the last query in their rows."""
+        for sprite in self._pending:
+            self._insert(sprite)
+        self._pending.clear()
+
+    def _span(self, rect):
+        """Get the first and last rows covered by a rect."""
+        return rect.top // self.cell_size, rect.bottom // self.cell_size
+
+    def _insert(self, sprite):
+        first, last = self._spans[sprite] = self._span(sprite.rect)
+        for row in range(first, last + 1):
+            if row not in self._rows:
+                self._rows[row] = {}
+                insort(self._keys, row)
+            self._rows[row][sprite] = None
+
+    def _discard(self, sprite):
+        first, last = self._spans.pop(sprite)
+        for row in range(first, last + 1):
+            bucket = self._rows[row]
+            del bucket[sprite]
+            if not bucket:
+                del self._rows[row]
+                del self._keys[bisect_left(self._keys, row)]
+
+    def move(self, sprite):
+        """Update the rows of a sprite after it moved.
+
+        Args:
+            sprite (pygame.sprite.Sprite): A sprite of this group.
+        """
+        if sprite not in self._spans:
+            return  # not indexed yet or already removed
+        if self._span(sprite.rect) != self._spans[sprite]:
+            self._discard(sprite)
+            self._insert(sprite)
+
+    def near(self, rect):
+        """Get the sprites in the rows around a rect.
+
+        Args:
+            rect (pygame.Rect): The area of interest.
+
+        Returns:
+            A list of sprites that may intersect the rect.
+        """
+        if self._pending:
+            self._flush()
+        first, last = self._span(rect)
+        rows = self._rows
+        found = {}
+        for row in range(first - 1, last + 2):
+            if row in rows:
+                found.update(rows[row])
+        return list(found)
+
+    def collide(self, sprite, dokill=False, collided=None, first=False):
+        """Find sprites in the group that intersect another sprite.
+
+        Works like pygame.sprite.spritecollide, but only tests the
+        sprites in the rows around the given sprite, and a collision
+        test (like a mask test) only runs for the sprites whose rects
+        intersect, since it is only true for those anyway.
+
+        Args:
+            sprite (pygame.sprite.Sprite): The sprite to test.
+            dokill (bool): Kill the sprites that collide.
+            collided (callable): Collision test, defaults to the rects.
+            first (bool): Stop at the first sprite that collides.
+
+        Returns:
+            A list of colliding sprites.
+        """
+        colliderect = sprite.rect.colliderect
+        hits = [s for s in self.near(sprite.rect) if colliderect(s.rect)]
+        if collided is not None and hits:
+            narrowed = []
+            for hit in hits:
+                self.narrow_tests += 1
+                if collided(sprite, hit):
+                    narrowed.append(hit)
+                    if first:
+                        break
+            hits = narrowed
+        elif first:
+            hits = hits[:1]
+        if dokill:
+            for hit in hits:
+                hit.kill()
+        return hits
+
+    def highest(self):
+        """Get the sprite with the lowest Y axis value.
+
+        Returns:
+            A sprite or None if the group is empty.
+        """
+        if self._pending:
+            self._flush()
+        if not self._keys:
+            return None
+        return min(self._rows[self._keys[0]], key=lambda s: s.rect.top)
+
+    def below(self, y):
+        """Get the sprites whose top is at or below a line.
+
+        Args:
+            y (int): Y axis value of the line.
+
+        Returns:
+            A list of sprites.
+        """
+        if self._pending:
+            self._flush()
+        keys = self._keys
+        found = {}
+        for index in range(bisect_left(keys, y // self.cell_size), len(keys)):
+            for sprite in self._rows[keys[index]]:
+                if sprite.rect.top >= y:
+                    found[sprite] = None
+        return list(found)
+
+    def above(self, y):
+        """Get the sprites whose bottom is above a line.
+
+        Args:
+            y (int): Y axis value of the line.
+
+        Returns:
+            A list of sprites.
+        """
+        if self._pending:
+            self._flush()
+        keys = self._keys
+        found = {}
+        for index in range(bisect_left(keys, y // self.cell_size + 1)):
+            for sprite in self._rows[keys[index]]:
+                if sprite.rect.bottom < y:
+                    found[sprite] = None
+        return list(found)
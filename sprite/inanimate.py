@@ -1,11 +1,10 @@
-import random
-
 import pygame
 
 import settings
+from sprite.pool import Pooled
 
 
-class Inanimate(pygame.sprite.Sprite):
+class Inanimate(Pooled, pygame.sprite.Sprite):
     """Describes common behavior and attributes between inanimate things."""
 
     def __init__(self, image, pos, groups):
@@ -15,10 +14,22 @@ class Inanimate(pygame.sprite.Sprite):
             pos (tuple): X and Y axis positions where the sprite will be draw.
             groups (list): A list of pygame.sprite.Group.
         """
-        super(Inanimate, self).__init__(groups)
+        super(Inanimate, self).__init__()
+        self.rect = image.get_rect()
+        Inanimate.reset(self, image, pos, groups)
+
+    def reset(self, image, pos, groups):
+        """Set the sprite up again, as if it was just made.
+
+        Args:
+            image (pygame.Surface): Image surface loaded via pygame.image.load.
+            pos (tuple): X and Y axis positions where the sprite will be draw.
+            groups (list): A list of pygame.sprite.Group.
+        """
         self.image = image
-        self.rect = self.image.get_rect()
-        self.rect.x, self.rect.y = pos
+        self.rect.size = image.get_size()
+        self.rect.topleft = pos
+        self.add(groups)
 
 
 class Platform(Inanimate):
@@ -28,6 +39,7 @@ class Platform(Inanimate):
         _layer (int): The layer where the platform will be draw.
         image_names (list): List of image names that
                             will be render inside the sprite.
+        attached (list): Items and springs put on the platform.
     """
 
     _layer = settings.PLATFORM_LAYER
@@ -60,25 +72,36 @@ class Platform(Inanimate):
             pos (tuple): X and Y axis positions.
             groups (list): The list of groups the platform belongs to.
         """
+        self.attached = []
         super(Platform, self).__init__(image, pos, groups)
 
-    def update(self):
-        """Kills the platform when it gets off the screen."""
-        if self.rect.top >= settings.HEIGHT:
-            self.kill()
+    def reset(self, image, pos=(0, 0), groups=[]):
+        """Set the platform up again, as if it was just made."""
+        self.attached.clear()
+        super(Platform, self).reset(image, pos, groups)
+
+    def kill(self):
+        """Remove the platform along with the things put on it."""
+        for sprite in self.attached:
+            if sprite.platform is self:
+                sprite.kill()
+        self.attached.clear()
+        super(Platform, self).kill()
 
     @classmethod
-    def new(cls, game, image_name=None, **kwargs):
-        """Create a new instance of a platform.
+    def new(cls, game, image_name=None, pos=(0, 0), groups=[]):
+        """Create a new instance of a platform, or reuse a killed one.
 
         Args:
             game (Game): A reference for the running game.
             image_name (str): Type and image name separeted by a pipe.
+            pos (tuple): X and Y axis positions.
+            groups (list): The list of groups the platform belongs to.
         """
         if not image_name:
-            image_name = random.choice(cls.image_names)
+            image_name = game.rng.choice(cls.image_names)
         image = game.spritesheet.get_image(image_name)
-        return cls(image, **kwargs)
+        return game.pool.acquire((cls, image_name), cls, image, pos, groups)
 
 
 class Spring(Inanimate):
@@ -93,17 +116,25 @@ class Spring(Inanimate):
     _layer = settings.PLATFORM_LAYER
     image_names = ["spring.png", "spring_in.png", "spring_out.png"]
 
-    def __init__(self, images, platform, pos=(0, 0), groups=[]):
+    def __init__(self, game, images, platform, pos=(0, 0), groups=[]):
         """
         Args:
+            game (Game): A reference for the running game.
             images (list): List of spring image surfaces.
             platform (Platform): A platform where the spring will be attached.
             pos (tuple): X and Y axis positions.
             groups (list): The list of groups the spring belongs to.
         """
-        super(Spring, self).__init__(images[0], pos, groups)
+        super(Spring, self).__init__(images[0], pos, [])
+        Spring.reset(self, game, images, platform, pos, groups)
+
+    def reset(self, game, images, platform, pos=(0, 0), groups=[]):
+        """Set the spring up again, as if it was just made."""
+        super(Spring, self).reset(images[0], pos, groups)
+        self.game = game
         self.frames = images
         self.platform = platform
+        self.platform.attached.append(self)
         self.rect.centerx = self.platform.rect.centerx
         self.rect.bottom = self.platform.rect.top
         self.fired = False
@@ -111,7 +142,7 @@ class Spring(Inanimate):
 
     def animate(self):
         """Switch between image frames."""
-        now = pygame.time.get_ticks()
+        now = self.game.get_ticks()
 
         if self.fired:
             if now - self.last_update > 100:
@@ -137,15 +168,19 @@ class Spring(Inanimate):
         self.animate()
 
     @classmethod
-    def new(cls, game, platform, **kwargs):
-        """Create a new instance of a spring.
+    def new(cls, game, platform, pos=(0, 0), groups=[]):
+        """Create a new instance of a spring, or reuse a killed one.
 
         Args:
             game (Game): A reference for the running game.
             platform (Platform): A platform where the spring will be attached.
+            pos (tuple): X and Y axis positions.
+            groups (list): The list of groups the spring belongs to.
         """
         images = [game.spritesheet.get_image(img) for img in cls.image_names]
-        return cls(images, platform, **kwargs)
+        return game.pool.acquire(
+            (cls,), cls, game, images, platform, pos, groups
+        )
 
 
 class Cloud(Inanimate):
@@ -154,10 +189,12 @@ class Cloud(Inanimate):
     Attributes:
         _layer (int): The layer where the cloud will be draw.
         image_name (str): Cloud image name.
+        parallax (float): How fast clouds move with the camera.
     """
 
     _layer = settings.CLOUD_LAYER
     image_name = "cloud.png"
+    parallax = settings.CLOUD_PARALLAX
 
     def __init__(self, image, pos=(0, 0), groups=[]):
         """
@@ -168,21 +205,22 @@ class Cloud(Inanimate):
         """
         super(Cloud, self).__init__(image, pos, groups)
 
-    def update(self):
-        """Kills the cloud when it reaches two times the screen height."""
-        if self.rect.y > settings.HEIGHT * 2:
-            self.kill()
-
     @classmethod
-    def new(cls, image, **kwargs):
-        """Create a new instance of a cloud.
+    def new(cls, game, pos=(0, 0), groups=[]):
+        """Create a new instance of a cloud, or reuse a killed one.
+
+        The random scale is snapped to the closest of settings.CLOUD_SCALES,
+        whose images are scaled once by Game.load_data.
 
         Args:
-            image (pygame.Surface): Cloud image surface.
+            game (Game): A reference for the running game.
+            pos (tuple): X and Y axis positions.
+            groups (list): The list of groups the cloud belongs to.
         """
-        width = image.get_width()
-        height = image.get_height()
-        scale = random.randint(30, 101) / 100
-        size = (int(width * scale), int(height * scale))
-        img = pygame.transform.scale(image, size)
-        return cls(img, **kwargs)
+        scale = game.rng.randint(30, 101) / 100
+        index = min(
+            range(len(settings.CLOUD_SCALES)),
+            key=lambda i: abs(settings.CLOUD_SCALES[i] - scale),
+        )
+        image = game.cloud_images[index]
+        return game.pool.acquire((cls, index), cls, image, pos, groups)
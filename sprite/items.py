@@ -1,9 +1,10 @@
 import pygame
 
 import settings
+from sprite.pool import Pooled
 
 
-class Item(pygame.sprite.Sprite):
+class Item(Pooled, pygame.sprite.Sprite):
     """Describes common behavior and attributes between items.
 
     Attributes:
@@ -19,12 +20,25 @@ class Item(pygame.sprite.Sprite):
             platform (Platform): A platform where the item will be attached.
             groups (list): A list of pygame.sprite.Group.
         """
-        super(Item, self).__init__(groups)
+        super(Item, self).__init__()
+        self.rect = image.get_rect()
+        Item.reset(self, image, platform, groups)
+
+    def reset(self, image, platform, groups):
+        """Set the item up again, as if it was just made.
+
+        Args:
+            image (pygame.Surface): Image surface loaded via pygame.image.load.
+            platform (Platform): A platform where the item will be attached.
+            groups (list): A list of pygame.sprite.Group.
+        """
         self.image = image
-        self.rect = self.image.get_rect()
+        self.rect.size = image.get_size()
         self.platform = platform
+        self.platform.attached.append(self)
         self.rect.centerx = self.platform.rect.centerx
         self.rect.bottom = self.platform.rect.top - 5
+        self.add(groups)
 
     def update(self):
         """Kills item if its platform does not exist anymore
@@ -35,14 +49,16 @@ class Item(pygame.sprite.Sprite):
             self.rect.bottom = self.platform.rect.top - 5
 
     @classmethod
-    def new(cls, game, **kwargs):
-        """Create a new instance of a item.
+    def new(cls, game, platform, groups=[]):
+        """Create a new instance of a item, or reuse a killed one.
 
         Args:
             game (Game): A reference for the running game.
+            platform (Platform): A platform where the item will be attached.
+            groups (list): A list of pygame.sprite.Group.
         """
         image = game.spritesheet.get_image(cls.image_name)
-        return cls(image, **kwargs)
+        return game.pool.acquire((cls,), cls, image, platform, groups)
 
 
 class Carrot(Item):
@@ -50,6 +66,7 @@ class Carrot(Item):
 
     Attributes:
         image_name (str): Image name for the carrot.
+        stage (int): The stage the carrot clears, the current one if None.
     """
 
     image_name = "carrot.png"
@@ -62,6 +79,12 @@ class Carrot(Item):
             groups (list): A list of pygame.sprite.Group.
         """
         super(Carrot, self).__init__(image, platform, groups)
+        self.stage = None
+
+    def reset(self, image, platform, groups):
+        """Set the carrot up again, as if it was just made."""
+        super(Carrot, self).reset(image, platform, groups)
+        self.stage = None
 
 
 class Powerup(Item):
@@ -1,10 +1,10 @@
-import random
-
 import pygame
 from pygame.math import Vector2
 
+import controller
 import settings
 from sprite.items import Carrot, Jetpack
+from sprite.pool import Pooled
 
 
 class LivingBeing(pygame.sprite.Sprite):
@@ -13,6 +13,8 @@ class LivingBeing(pygame.sprite.Sprite):
     Attributes:
         image_names (list): List of image names that
                             will be render inside the sprite.
+        previous (tuple): Position of the sprite before the last update,
+                          None before its first one.
     """
 
     image_names = []
@@ -26,12 +28,14 @@ class LivingBeing(pygame.sprite.Sprite):
             groups (list): A list of pygame.sprite.Group.
         """
         super(LivingBeing, self).__init__(groups)
-        self._image_frames(images)
         self.game = game
+        self._image_frames(images)
         self.image = images[0]
+        self.mask = game.spritesheet.get_mask(self.image)
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = pos
         self.last_update = 0
+        self.previous = None
 
     def _image_frames(self, images):
         """Save image list.
@@ -101,15 +105,13 @@ class Player(LivingBeing):
 
         for frame in self.image_frames["walkr"]:
             self.image_frames["walkl"].append(
-                pygame.transform.flip(frame, True, False)
+                self.game.spritesheet.flip(frame)
             )
 
     def standing(self):
         """Check if the player is standing over a platform."""
         if self.vel.y > 0 and self.alive:
-            hits = pygame.sprite.spritecollide(
-                self, self.game.platforms, False
-            )
+            hits = self.game.platforms.collide(self)
             if hits:
                 lowest = hits[0]
                 for hit in hits:
@@ -127,10 +129,10 @@ class Player(LivingBeing):
 
     def walk(self):
         """Move the player backwards/forwards if an arrow key was pressed."""
-        key = pygame.key.get_pressed()
-        if key[pygame.K_LEFT]:
+        commands = self.game.commands
+        if commands & controller.LEFT:
             self.acc.x = -settings.PLAYER_ACC
-        if key[pygame.K_RIGHT]:
+        if commands & controller.RIGHT:
             self.acc.x = settings.PLAYER_ACC
 
         # apply friction
@@ -157,12 +159,12 @@ class Player(LivingBeing):
     def jump(self):
         """Perform a jump."""
         self.rect.y += 2
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
+        hits = self.game.platforms.collide(self)
         self.rect.y -= 2
         if hits and not self.jumping:
             self.jumping = True
             self.vel.y = settings.PLAYER_STRENGTH
-            self.game.jump_sound.play()
+            self.game.mixer.play("jump")
 
     def cut_jump(self):
         """Shrink the jump."""
@@ -173,23 +175,19 @@ class Player(LivingBeing):
     def hit_item(self):
         """Check if the player hitted an item."""
         if self.alive:
-            for hit in pygame.sprite.spritecollide(
-                self, self.game.items, True
-            ):
+            for hit in self.game.items.collide(self, True):
                 if isinstance(hit, Carrot):
-                    self.game.stage_clear()
+                    self.game.stage_clear(hit.stage)
                     break
                 elif isinstance(hit, Jetpack):
                     self.boosted = True
                     self.vel.y = settings.BOOST_POWER
-                    self.game.powerup_sound.play()
+                    self.game.mixer.play("powerup")
 
     def hit_spring(self):
         """Check if the player hitted an spring."""
         if self.alive:
-            for hit in pygame.sprite.spritecollide(
-                self, self.game.springs, False
-            ):
+            for hit in self.game.springs.collide(self):
                 if not hit.fired:
                     edges = [
                         self.rect.bottom
@@ -201,21 +199,22 @@ class Player(LivingBeing):
                         hit.fired = True
                         self.boosted = True
                         self.vel.y = settings.BOOST_SPRING
-                        self.game.spring_sound.play()
+                        self.game.mixer.play("spring")
                         break
 
     def hit_enemy(self):
         """Check if the player hitted a enemy."""
         if self.alive:
-            for hit in pygame.sprite.spritecollide(
-                self, self.game.enemies, False, pygame.sprite.collide_mask
+            for hit in self.game.enemies.collide(
+                self, collided=pygame.sprite.collide_mask, first=True
             ):
                 self.alive = False
-                self.game.death_sound.play()
+                self.game.death = self.game.death or "enemy"
+                self.game.mixer.play("death")
 
     def animate(self):
         """Switch between image frames."""
-        now = pygame.time.get_ticks()
+        now = self.game.get_ticks()
 
         if not self.alive:
             if now - self.last_update > 100:
@@ -253,48 +252,55 @@ class Player(LivingBeing):
                 self.rect.bottom = bottom
 
         # update sprite mask
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.game.spritesheet.get_mask(self.image)
 
     def update(self):
         """Check if the player is alive and perform
         all animations like walking, jumping, etc."""
 
+        profiler = self.game.profiler
+        self.previous = self.rect.topleft
+
         # reset acceleration and gravity values
         self.acc = Vector2(0, settings.GRAVITY)
 
         # test if the player collided with any platform
-        self.standing()
+        with profiler.phase("collision"):
+            self.standing()
 
         # move left or right according to players command
         self.walk()
 
-        # check for poweups
-        self.hit_item()
+        with profiler.phase("collision"):
+            # check for poweups
+            self.hit_item()
 
-        # check for springs
-        self.hit_spring()
+            # check for springs
+            self.hit_spring()
 
-        # check if hit a mob
-        self.hit_enemy()
+            # check if hit a mob
+            self.hit_enemy()
 
         # animate player sprite
-        self.animate()
+        with profiler.phase("animation"):
+            self.animate()
 
         # update player position
         self.rect.midbottom = self.pos
 
         # when player gets close to the top initiate the view scrolling
-        if self.rect.top <= settings.HEIGHT / 4:
+        camera = self.game.camera
+        if self.rect.top - camera.top() <= settings.HEIGHT / 4:
             amount = max(abs(self.vel.y), 2)
-            self.pos.y += amount
-            self.game.scroll(amount)
+            with profiler.phase("scroll"):
+                self.game.scroll(amount)
 
         # if the player falls the game is over
-        if self.rect.bottom > settings.HEIGHT:
+        if self.rect.bottom > camera.bottom():
             self.game.over()
 
 
-class Enemy(LivingBeing):
+class Enemy(Pooled, LivingBeing):
     """Describes common behavior and attributes between enemies.
 
     Attributes:
@@ -306,6 +312,18 @@ class Enemy(LivingBeing):
     def __init__(self, *args, **kwargs):
         super(Enemy, self).__init__(*args, **kwargs)
 
+    @classmethod
+    def new(cls, game, pos=(0, 0), groups=[]):
+        """Create a new instance of the enemy, or reuse a killed one.
+
+        Args:
+            game (Game): A reference for the running game.
+            pos (tuple): X and Y axis positions where it will be draw.
+            groups (list): A list of pygame.sprite.Group.
+        """
+        images = [game.spritesheet.get_image(i) for i in cls.image_names]
+        return game.pool.acquire((cls,), cls, game, images, pos, groups)
+
 
 class FlyMan(Enemy):
     """A flying enemy with a propeller in the head.
@@ -331,20 +349,34 @@ class FlyMan(Enemy):
             pos (tuple): X and Y axis positions where the FlyMan will be draw.
             groups (list): A list of pygame.sprite.Group.
         """
-        super(FlyMan, self).__init__(game, images, pos, groups)
-        self.vx = random.randrange(1, 4)
+        super(FlyMan, self).__init__(game, images, pos, [])
+        FlyMan.reset(self, game, images, pos, groups)
+
+    def reset(self, game, images, pos, groups):
+        """Set the FlyMan up again, as if it was just made."""
+        self.image = images[0]
+        self.mask = game.spritesheet.get_mask(self.image)
+        self.rect.size = self.image.get_size()
+        self.rect.topleft = pos
+        self.last_update = 0
+        self.previous = None
+        self.vx = game.rng.randrange(1, 4)
         self.vy = 0
         self.dy = 0.5
 
         # if it starts on the right side of the screen
         if self.rect.x > settings.WIDTH / 2:
             self.vx *= -1  # invert direction
+        self.add(groups)
 
     def update(self):
         """Move FlyMan or kill it if leaves the screen."""
+        self.previous = self.rect.topleft
         self.rect.x += self.vx
         self.vy += self.dy
         self.rect.y += self.vy
+        self.game.enemies.move(self)
+        camera = self.game.camera
 
         # switch direction on Y axis if reached the boundaries
         if self.vy > 3 or self.vy < -3:
@@ -353,7 +385,7 @@ class FlyMan(Enemy):
         if (
             self.rect.left > settings.WIDTH + 100
             or self.rect.right < -100
-            or self.rect.top >= settings.HEIGHT
+            or self.rect.top >= camera.bottom()
         ):
             self.kill()
         else:
@@ -361,7 +393,7 @@ class FlyMan(Enemy):
 
     def animate(self):
         """Switch between image frames."""
-        now = pygame.time.get_ticks()
+        now = self.game.get_ticks()
 
         if now - self.last_update > settings.FPS:
             self.last_update = now
@@ -377,5 +409,5 @@ class FlyMan(Enemy):
                 else:
                     self.image = self.image_frames[1]
             self.rect = self.image.get_rect()
-            self.mask = pygame.mask.from_surface(self.image)
+            self.mask = self.game.spritesheet.get_mask(self.image)
             self.rect.center = center
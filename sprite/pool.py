@@ -0,0 +1,87 @@
+class SpritePool(object):
+    """Recycle killed sprites instead of making new ones.
+
+    Sprites are kept apart by a key, usually their class and whatever
+    variant makes them different (like the image), so a recycled sprite
+    only needs its state reset in place. Sprites made by a pool go back
+    to it when killed, see Pooled.
+
+    Attributes:
+        enabled (bool): Whether killed sprites are kept for reuse.
+        made (int): How many sprites were made.
+        reused (int): How many sprites were taken from the pool.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Args:
+            enabled (bool): Whether killed sprites are kept for reuse.
+        """
+        super(SpritePool, self).__init__()
+        self.enabled = enabled
+        self.made = 0
+        self.reused = 0
+        self._free = {}
+
+    def __len__(self):
+        """Get how many sprites are waiting to be reused."""
+        return sum(len(free) for free in self._free.values())
+
+    def acquire(self, key, cls, *args):
+        """Get a sprite, reusing a killed one when there is any.
+
+        Args:
+            key (hashable): The kind of sprite.
+            cls (type): A Pooled sprite class, made with args when
+                        there is no sprite to reuse.
+            args: Passed on to the reset method of reused sprites.
+
+        Returns:
+            A sprite.
+        """
+        free = self._free.get(key)
+        if free:
+            self.reused += 1
+            sprite = free.pop()
+            sprite.reset(*args)
+            return sprite
+        self.made += 1
+        sprite = cls(*args)
+        sprite.pool = self
+        sprite.pool_key = key
+        return sprite
+
+    def release(self, sprite):
+        """Keep a killed sprite for reuse.
+
+        Args:
+            sprite (Pooled): A sprite made by this pool.
+        """
+        if self.enabled:
+            self._free.setdefault(sprite.pool_key, []).append(sprite)
+
+    def clear(self):
+        """Forget all sprites waiting to be reused."""
+        self._free.clear()
+
+
+class Pooled(object):
+    """Mixin for sprites that go back to their pool when killed.
+
+    Subclasses must have a reset method taking the same arguments as
+    their constructor, setting up the sprite as if it was just made.
+
+    Attributes:
+        pool (SpritePool): The pool that made the sprite, if any.
+        pool_key (hashable): The kind of sprite in the pool.
+    """
+
+    pool = None
+    pool_key = None
+
+    def kill(self):
+        """Remove the sprite from all groups and give it back to its pool."""
+        alive = bool(self.groups())
+        super(Pooled, self).kill()
+        if alive and self.pool is not None:
+            self.pool.release(self)
@@ -1,22 +1,254 @@
-from xml.dom import minidom
+import mmap
+import struct
+import weakref
+from os import path
 
 import pygame
 
 import settings
+from cache import LRUCache
+from metrics import RateCounter
+
+
+def parse_atlas(file_name):
+    """Build an index of the sub textures described in an atlas file.
+
+    The file is read with a streaming parser and every element is discarded
+    as soon as its attributes are collected, so no document tree is kept.
+
+    Args:
+        file_name (str): Atlas (full path) file name.
+
+    Returns:
+        A dictionary mapping image names to (x, y, width, height) tuples.
+    """
+    # only the raw spritesheet needs it, the baked one has its own index
+    from xml.etree.ElementTree import iterparse
+
+    index = {}
+    for _, node in iterparse(file_name):
+        if node.tag == "SubTexture":
+            index[node.get("name")] = (
+                int(node.get("x")),
+                int(node.get("y")),
+                int(node.get("width")),
+                int(node.get("height")),
+            )
+        node.clear()
+    return index
+
+
+# baked index layout: a header followed by one fixed size record per image
+INDEX_MAGIC = b"BJAT"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sHIf")  # magic, version, count, scale
+INDEX_NAME_SIZE = 32  # bytes of an image name, UTF-8 encoded
+INDEX_RECORD = struct.Struct(f"<{INDEX_NAME_SIZE}s4H")  # name, x, y, w, h
+
+
+def baked_paths(file_name):
+    """Get the baked atlas image and index file names of a spritesheet.
+
+    Args:
+        file_name (str): Spritesheet (full path) file name.
+
+    Returns:
+        Two file names (image, index).
+    """
+    root, ext = path.splitext(file_name)
+    return root + ".baked" + ext, root + ".baked.idx"
+
+
+def check_names(names):
+    """Make sure image names fit in the records of a baked index.
+
+    Args:
+        names (iterable): The image names.
+
+    Raises:
+        ValueError: If a name is longer than INDEX_NAME_SIZE bytes.
+    """
+    for name in names:
+        if len(name.encode()) > INDEX_NAME_SIZE:
+            raise ValueError(
+                f"{name} is longer than {INDEX_NAME_SIZE} bytes,"
+                " too long for a baked atlas index."
+            )
+
+
+def write_index(file_name, index, scale):
+    """Write an atlas index in the packed binary format.
+
+    Args:
+        file_name (str): Index (full path) file name.
+        index (dict): Image names mapped to (x, y, width, height) tuples.
+        scale (float): The scale the images in the atlas were baked with.
+
+    Raises:
+        ValueError: If an image name is too long for the index.
+    """
+    check_names(index)
+    with open(file_name, "wb") as f:
+        f.write(
+            INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(index), scale)
+        )
+        for name, rect in index.items():
+            f.write(INDEX_RECORD.pack(name.encode(), *rect))
+
+
+def read_index(file_name):
+    """Read an atlas index written by write_index.
+
+    The file is memory mapped and the records are unpacked in place.
+
+    Args:
+        file_name (str): Index (full path) file name.
+
+    Returns:
+        Two values are returned (index, scale).
+        index (dict): Image names mapped to (x, y, width, height) tuples.
+        scale (float): The scale the images in the atlas were baked with.
+
+    Raises:
+        ValueError: If the file is not a baked atlas index.
+    """
+    with open(file_name, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version, count, scale = INDEX_HEADER.unpack_from(data)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError(f"{file_name} is not a baked atlas index.")
+            index = {}
+            offset = INDEX_HEADER.size
+            for _ in range(count):
+                name, *rect = INDEX_RECORD.unpack_from(data, offset)
+                index[name.rstrip(b"\0").decode()] = tuple(rect)
+                offset += INDEX_RECORD.size
+    return index, scale
+
+
+def bake(file_name, scale=settings.SPRITE_SCALE, max_width=1024, padding=1):
+    """Write a pre-scaled copy of a spritesheet and its binary index.
+
+    Every image is cut out of the spritesheet, scaled the same way
+    Spritesheet.get_image does at runtime and packed in rows (tallest
+    images first) into a new atlas.
+
+    Args:
+        file_name (str): Spritesheet (full path) file name.
+        scale (float): Scale factor applied to the images.
+        max_width (int): Width of the baked atlas.
+        padding (int): Empty pixels between packed images.
+
+    Returns:
+        Two file names (image, index) of the baked files.
+
+    Raises:
+        ValueError: If an image name is too long for the index.
+    """
+    # drop the alpha channel the same way Surface.convert does at runtime
+    sheet = pygame.image.load(file_name)
+    sheet = pygame.image.fromstring(
+        pygame.image.tostring(sheet, "RGB"), sheet.get_size(), "RGB"
+    )
+    info = parse_atlas(file_name.replace(".png", ".xml"))
+    check_names(info)
+    images = {}
+    for name, (x, y, width, height) in info.items():
+        image = sheet.subsurface((x, y, width, height))
+        size = (int(width * scale), int(height * scale))
+        images[name] = pygame.transform.scale(image, size)
+
+    # shelf packing
+    index = {}
+    x = y = shelf_height = 0
+    for name in sorted(images, key=lambda n: -images[n].get_height()):
+        width, height = images[name].get_size()
+        if x + width > max_width:
+            x, y = 0, y + shelf_height + padding
+            shelf_height = 0
+        index[name] = (x, y, width, height)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+
+    atlas = pygame.Surface((max_width, y + shelf_height))
+    atlas.fill(settings.BLACK)
+    for name, (x, y, _, _) in index.items():
+        atlas.blit(images[name], (x, y))
+
+    image_file, index_file = baked_paths(file_name)
+    pygame.image.save(atlas, image_file)
+    write_index(index_file, index, scale)
+    return image_file, index_file
 
 
 class Spritesheet(object):
-    """Manage image spritesheets."""
+    """Manage image spritesheets.
+
+    Images are scaled once and kept in a LRU cache, so the surfaces handed
+    out are shared between sprites and must be treated as read-only.
+
+    Collision masks and mirrored images are also built only once for
+    each surface and live as long as the surface they were made from.
+
+    Attributes:
+        cache (LRUCache): Scaled images keyed by (name, scale, color key).
+        mask_builds (RateCounter): How many collision masks were built.
+    """
 
-    def __init__(self, file_name, color_key=settings.BLACK):
+    def __init__(
+        self,
+        file_name,
+        color_key=settings.BLACK,
+        scale=settings.SPRITE_SCALE,
+        cache_size=settings.SPRITE_CACHE_SIZE,
+        info=None,
+    ):
         """
         Args:
             file_name (str): Spritesheet (full path) file name.
+            color_key (tuple): Default transparent color of the images.
+            scale (float): Default scale factor applied to the images.
+            cache_size (int): How many scaled images are kept in memory.
+            info (dict): Image names mapped to (x, y, width, height) tuples,
+                         parsed from the XML next to file_name if omitted.
         """
         super(Spritesheet, self).__init__()
         self.image = pygame.image.load(file_name).convert()
-        self.info = minidom.parse(file_name.replace(".png", ".xml"))
+        if info is None:
+            info = parse_atlas(file_name.replace(".png", ".xml"))
+        self.info = info
         self.color_key = color_key
+        self.scale = scale
+        self.cache = LRUCache(cache_size)
+        self.mask_builds = RateCounter()
+        self._masks = weakref.WeakKeyDictionary()
+        self._flipped = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def load(cls, file_name, baked=True, **kwargs):
+        """Load a spritesheet, preferring its baked version.
+
+        The baked atlas is only used when it is newer than the spritesheet
+        and was baked with the scale being requested.
+
+        Args:
+            file_name (str): Spritesheet (full path) file name.
+            baked (bool): Whether a baked atlas may be used.
+        """
+        scale = kwargs.pop("scale", settings.SPRITE_SCALE)
+        image_file, index_file = baked_paths(file_name)
+        sources = (file_name, file_name.replace(".png", ".xml"))
+        if (
+            baked
+            and path.exists(image_file)
+            and path.exists(index_file)
+            and min(path.getmtime(image_file), path.getmtime(index_file))
+            >= max(path.getmtime(f) for f in sources)
+        ):
+            info, baked_scale = read_index(index_file)
+            if abs(baked_scale - scale) < 1e-6:
+                return cls(image_file, scale=1, info=info, **kwargs)
+        return cls(file_name, scale=scale, **kwargs)
 
     def get_info(self, image_name):
         """Get image position and size.
@@ -36,34 +268,83 @@ class Spritesheet(object):
         Raises:
             ValueError: If no entry was found for image_name.
         """
-        nodes = self.info.getElementsByTagName("SubTexture")
-        for node in nodes:
-            if node.getAttribute("name") == image_name:
-                return map(
-                    int,
-                    (
-                        node.getAttribute("x"),
-                        node.getAttribute("y"),
-                        node.getAttribute("width"),
-                        node.getAttribute("height"),
-                    ),
-                )
-        raise ValueError(f"{image_name} not found in spritesheet.")
-
-    def get_image(self, image_name):
+        try:
+            return self.info[image_name]
+        except KeyError:
+            raise ValueError(f"{image_name} not found in spritesheet.")
+
+    def get_image(self, image_name, scale=None, color_key=None, copy=False):
         """Get image by name.
 
         Args:
             image_name (str): The image name.
+            scale (float): Scale factor, defaults to the spritesheet scale.
+            color_key (tuple): Transparent color, defaults to the
+                               spritesheet color key.
+            copy (bool): Return a private copy instead of the shared surface.
 
         Returns:
             A pygame.Surface instance representing the image.
         """
+        if scale is None:
+            scale = self.scale
+        if color_key is None:
+            color_key = self.color_key
+        key = (image_name, scale, tuple(color_key))
+        image = self.cache.get(
+            key, lambda: self._build_image(image_name, scale, color_key)
+        )
+        return image.copy() if copy else image
+
+    def _build_image(self, image_name, scale, color_key):
+        """Cut an image out of the spritesheet and scale it.
+
+        Args:
+            image_name (str): The image name.
+            scale (float): Scale factor.
+            color_key (tuple): Transparent color.
+
+        Returns:
+            A new pygame.Surface instance representing the image.
+        """
         x, y, width, height = self.get_info(image_name)
         image = pygame.Surface((width, height))
         image.blit(self.image, (0, 0), (x, y, width, height))
-        image = pygame.transform.scale(
-            image, (width * 2 // 5, height * 2 // 5)
-        )
-        image.set_colorkey(self.color_key)
+        if scale != 1:
+            image = pygame.transform.scale(
+                image, (int(width * scale), int(height * scale))
+            )
+        image.set_colorkey(color_key)
         return image
+
+    def get_mask(self, image):
+        """Get the collision mask of an image.
+
+        Args:
+            image (pygame.Surface): An image surface.
+
+        Returns:
+            A pygame.mask.Mask instance shared by every sprite using image.
+        """
+        try:
+            return self._masks[image]
+        except KeyError:
+            self.mask_builds.add()
+            mask = self._masks[image] = pygame.mask.from_surface(image)
+            return mask
+
+    def flip(self, image):
+        """Get an image mirrored horizontally.
+
+        Args:
+            image (pygame.Surface): An image surface.
+
+        Returns:
+            A pygame.Surface instance shared by every sprite using image.
+        """
+        try:
+            return self._flipped[image]
+        except KeyError:
+            flipped = pygame.transform.flip(image, True, False)
+            self._flipped[image] = flipped
+            return flipped
@@ -0,0 +1,245 @@
+import settings
+from sprite.living import FlyMan
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SwarmFlyMan(FlyMan):
+    """A FlyMan moved by the Swarm of its game instead of by itself.
+
+    Its rect, image and mask are only kept up to date while it is near
+    the screen, its vx, vy and dy attributes are only the ones it
+    started with.
+    """
+
+    def __init__(self, game, images, pos, groups):
+        super(SwarmFlyMan, self).__init__(game, images, pos, groups)
+        game.swarm.add(self)
+
+    def reset(self, game, images, pos, groups):
+        """Set the FlyMan up again, as if it was just made."""
+        super(SwarmFlyMan, self).reset(game, images, pos, groups)
+        game.swarm.add(self)
+
+    def update(self):
+        """Do nothing, the swarm moves it."""
+
+    def kill(self):
+        """Remove the FlyMan from the swarm and from all groups."""
+        if self.alive():
+            self.game.swarm.remove(self)
+        super(SwarmFlyMan, self).kill()
+
+
+class Swarm(object):
+    """Move every FlyMan of a game at once, with NumPy arrays.
+
+    The position, size, speed, bob direction and animation of every
+    FlyMan are kept in arrays, one slot per FlyMan, and stepped with a
+    few array operations per update instead of an update call each.
+    FlyMen leaving the world are found in bulk, and only the ones near
+    the screen, the only ones drawn or touching the player, get their
+    rect, image and mask set from the arrays.
+
+    The steps are the same as FlyMan.update, rounding positions like
+    pygame.Rect does, so a game plays the same with or without a swarm.
+
+    Attributes:
+        game (Game): A reference for the running game.
+        margin (int): How far out of the screen FlyMen are still synced.
+    """
+
+    def __init__(self, game, capacity=64, margin=100):
+        """
+        Args:
+            game (Game): A reference for the running game.
+            capacity (int): How many FlyMen fit before the arrays grow.
+            margin (int): How far out of the screen FlyMen are still
+                          synced.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError("Swarm needs NumPy")
+        super(Swarm, self).__init__()
+        self.game = game
+        self.margin = margin
+        self._slots = {}
+        self._sprites = []
+        self._free = []
+        self._frames = None
+        self._masks = None
+        self._widths = None
+        self._heights = None
+        self._allocate(capacity)
+
+    @staticmethod
+    def available():
+        """Tell whether NumPy is installed."""
+        return numpy is not None
+
+    def __len__(self):
+        """Get how many FlyMen there are."""
+        return len(self._slots)
+
+    def _allocate(self, capacity):
+        """Make the arrays hold a number of slots, keeping their values."""
+        start = len(self._sprites)
+        arrays = {
+            "x": numpy.int64,
+            "y": numpy.int64,
+            "w": numpy.int64,
+            "h": numpy.int64,
+            "vx": numpy.int64,
+            "vy": numpy.float64,
+            "dy": numpy.float64,
+            "last": numpy.int64,
+            "frame": numpy.int64,
+            "alive": bool,
+            "shown": bool,
+            "top": numpy.int64,
+            "bottom": numpy.int64,
+        }
+        for name, dtype in arrays.items():
+            array = numpy.zeros(capacity, dtype=dtype)
+            if start:
+                array[:start] = getattr(self, name)
+            setattr(self, name, array)
+        self._sprites.extend([None] * (capacity - start))
+        self._free.extend(range(capacity - 1, start - 1, -1))
+
+    def add(self, sprite):
+        """Start moving a FlyMan.
+
+        Args:
+            sprite (SwarmFlyMan): A FlyMan just made or reset.
+        """
+        if self._frames is None:
+            self._frames = sprite.image_frames
+            self._masks = [
+                self.game.spritesheet.get_mask(image) for image in self._frames
+            ]
+            self._widths = numpy.array([i.get_width() for i in self._frames])
+            self._heights = numpy.array([i.get_height() for i in self._frames])
+        if not self._free:
+            self._allocate(len(self._sprites) * 2)
+        slot = self._free.pop()
+        self._slots[sprite] = slot
+        self._sprites[slot] = sprite
+        rect = sprite.rect
+        self.x[slot], self.y[slot] = rect.topleft
+        self.w[slot], self.h[slot] = rect.size
+        self.vx[slot] = sprite.vx
+        self.vy[slot] = sprite.vy
+        self.dy[slot] = sprite.dy
+        self.last[slot] = sprite.last_update
+        self.frame[slot] = self._frames.index(sprite.image)
+        self.alive[slot] = True
+        self.shown[slot] = False
+        self.top[slot] = self.bottom[slot] = -(2**62)  # moved on first sync
+
+    def remove(self, sprite):
+        """Stop moving a FlyMan.
+
+        Args:
+            sprite (SwarmFlyMan): One of the FlyMen of the swarm.
+        """
+        slot = self._slots.pop(sprite)
+        self._sprites[slot] = None
+        self.alive[slot] = False
+        self.shown[slot] = False
+        self._free.append(slot)
+
+    def update(self):
+        """Move every FlyMan, as FlyMan.update would."""
+        if not self._slots:
+            return
+        x, y, w, h = self.x, self.y, self.w, self.h
+        alive = self.alive
+        camera = self.game.camera
+
+        x += self.vx
+        self.vy += self.dy
+        moved = y + self.vy
+        # pygame.Rect rounds halves away from zero
+        y[:] = numpy.trunc(moved + numpy.copysign(0.5, moved))
+        self.dy[numpy.abs(self.vy) > 3] *= -1
+
+        # the ones leaving the world are killed
+        gone = alive & (
+            (x > settings.WIDTH + 100)
+            | (x + w < -100)
+            | (y >= camera.bottom())
+        )
+        for slot in numpy.flatnonzero(gone).tolist():
+            self._sprites[slot].kill()
+
+        # switch between image frames, keeping the centers in place
+        now = self.game.get_ticks()
+        due = alive & (now - self.last > settings.FPS)
+        if due.any():
+            self.last[due] = now
+            frame = self.frame[due]
+            going_up = self.dy[due] < 0
+            frame = numpy.where(
+                going_up,
+                numpy.where(frame == 0, 3, 0),
+                numpy.where(frame == 1, 4, 1),
+            )
+            centerx = x[due] + w[due] // 2
+            centery = y[due] + h[due] // 2
+            self.frame[due] = frame
+            w[due] = self._widths[frame]
+            h[due] = self._heights[frame]
+            x[due] = centerx - w[due] // 2
+            y[due] = centery - h[due] // 2
+
+        # only the ones near the screen, or just leaving it, are synced,
+        # their images only when they change and their rows in the grid
+        # only when they move to other rows
+        margin = self.margin
+        near = alive & (
+            (x + w > -margin)
+            & (x < settings.WIDTH + margin)
+            & (y + h > camera.top() - margin)
+            & (y < camera.bottom() + margin)
+        )
+        shown = self.shown
+        synced = near | shown
+        looks = numpy.flatnonzero(synced & (due | ~shown))
+        self.shown = near
+        frames, masks = self._frames, self._masks
+        for slot, width, height, number in zip(
+            looks.tolist(),
+            w[looks].tolist(),
+            h[looks].tolist(),
+            self.frame[looks].tolist(),
+        ):
+            sprite = self._sprites[slot]
+            sprite.image = frames[number]
+            sprite.mask = masks[number]
+            sprite.rect.size = (width, height)
+
+        cell = self.game.enemies.cell_size
+        top, bottom = y // cell, (y + h) // cell
+        rows = synced & ((top != self.top) | (bottom != self.bottom))
+        self.top[synced] = top[synced]
+        self.bottom[synced] = bottom[synced]
+        synced = numpy.flatnonzero(synced)
+        for slot, left, top_y, was_shown in zip(
+            synced.tolist(),
+            x[synced].tolist(),
+            y[synced].tolist(),
+            shown[synced].tolist(),
+        ):
+            sprite = self._sprites[slot]
+            # the rects of the ones just coming near are out of date
+            sprite.previous = sprite.rect.topleft if was_shown else None
+            sprite.rect.topleft = (left, top_y)
+        enemies = self.game.enemies
+        for slot in numpy.flatnonzero(rows).tolist():
+            enemies.move(self._sprites[slot])
@@ -0,0 +1,128 @@
+import sys
+import time
+
+
+class ImportTimer(object):
+    """Time every module imported while installed, like -X importtime.
+
+    It sits first in sys.meta_path, finds modules through the finders
+    after it and times how long each module takes to run, with and
+    without the modules it imports itself. Built-in and frozen modules
+    are not timed.
+
+    Attributes:
+        times (list): Three values (name, self, cumulative) for every
+                      module imported, in seconds, in the order they
+                      finished.
+        depth (dict): How deep in the imports each module was imported,
+                      0 for the ones imported by the timed code itself.
+    """
+
+    def __init__(self):
+        super(ImportTimer, self).__init__()
+        self.times = []
+        self.depth = {}
+        self._inner = []
+
+    def install(self):
+        """Start timing imports."""
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """Stop timing imports."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        """Find a module with the other finders and time its loading."""
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # built-in and frozen importers are classes shared by every module
+        if isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+
+        def timed(module):
+            self.depth[name] = len(self._inner)
+            self._inner.append(0.0)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                inner = self._inner.pop()
+                self.times.append((name, elapsed - inner, elapsed))
+                if self._inner:
+                    self._inner[-1] += elapsed
+
+        loader.exec_module = timed
+        return spec
+
+
+class StartupProfile(object):
+    """Time the phases of the startup, up to the first frame on screen.
+
+    Attributes:
+        started (float): When the startup began, from time.perf_counter.
+        phases (list): Two values (name, seconds) for every phase, in the
+                       order they finished.
+        imports (ImportTimer): Times the imports.
+    """
+
+    def __init__(self, started=None):
+        """
+        Args:
+            started (float): When the startup began, from
+                             time.perf_counter, now if omitted.
+        """
+        super(StartupProfile, self).__init__()
+        self.started = time.perf_counter() if started is None else started
+        self.phases = []
+        self.imports = ImportTimer()
+        self._last = self.started
+
+    def mark(self, name):
+        """End a phase, started when the previous one ended.
+
+        Args:
+            name (str): The phase name.
+        """
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def report(self, count=15):
+        """Get the time of every phase and of the slowest imports.
+
+        Args:
+            count (int): How many imports to show.
+
+        Returns:
+            A list of lines of text.
+        """
+        lines = [f"{'phase':<44}{'ms':>10}"]
+        for name, seconds in self.phases:
+            lines.append(f"{name:<44}{seconds * 1e3:>10.1f}")
+        total = self._last - self.started
+        lines.append(f"{'total':<44}{total * 1e3:>10.1f}")
+        if self.imports.times:
+            lines.append("")
+            lines.append(f"{'import':<44}{'self ms':>10}{'cumulative':>12}")
+            slowest = sorted(
+                self.imports.times, key=lambda entry: entry[2], reverse=True
+            )
+            for name, own, cumulative in slowest[:count]:
+                indent = "  " * self.imports.depth[name]
+                lines.append(
+                    f"{indent + name:<44}{own * 1e3:>10.1f}"
+                    f"{cumulative * 1e3:>12.1f}"
+                )
+        return lines
@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+# the games are headless, but pygame still needs drivers to start
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+@pytest.fixture(scope="session")
+def game():
+    """A headless game, shared by the tests that play one."""
+    from game import Game
+
+    game = Game(headless=True)
+    yield game
+    if game.generator:
+        game.generator.close()
+    game.assets.close()
@@ -0,0 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from assets import AssetManager
+
+
+def test_waits_are_only_kept_for_the_main_thread():
+    assets = AssetManager()
+    try:
+        assets.load("first", lambda: 1)
+        assets.load("second", lambda: assets.get("first") + 1)
+        assets.load("third", lambda: assets.result("second") + 1)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(assets.get, "first").result() == 1
+        assert assets.waits == {}
+        assert assets.get("third") == 3
+        assert list(assets.waits) == ["third"]
+    finally:
+        assets.close()
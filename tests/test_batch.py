@@ -0,0 +1,21 @@
+import argparse
+
+import pytest
+
+import settings
+from batch import VARIANT_SETTINGS, parse_variant
+
+
+def test_variant_settings_exist():
+    assert all(hasattr(settings, name) for name in VARIANT_SETTINGS)
+
+
+def test_parse_variant():
+    overrides = parse_variant("GRAVITY=0.9, ENDLESS=False")
+    assert overrides == {"GRAVITY": 0.9, "ENDLESS": False}
+
+
+@pytest.mark.parametrize("text", ["NOPE=1", "HEIGHT=800"])
+def test_parse_variant_refuses(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_variant(text)
@@ -0,0 +1,29 @@
+from cache import LRUCache
+
+
+def test_builds_once():
+    cache = LRUCache(maxsize=2)
+    calls = []
+    for _ in range(3):
+        assert cache.get("a", lambda: calls.append("a") or 1) == 1
+    assert calls == ["a"]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1)
+    cache.get("c", lambda: 3)
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_clear():
+    cache = LRUCache()
+    cache.get("a", lambda: 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
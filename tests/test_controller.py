@@ -0,0 +1,23 @@
+import pygame
+import pytest
+
+import settings
+from controller import ClimbingController
+
+
+def test_keeps_its_way_around_the_screen():
+    controller = ClimbingController()
+    target = pygame.Rect(50, -720, 152, 37)
+    period = settings.WIDTH + 60
+    # both ways are about as long, the first one taken is kept
+    way = controller.distance(396, target, period)
+    for x in (395, 397, 394, 398):
+        assert controller.distance(x, target, period) * way > 0
+
+
+@pytest.mark.parametrize("seed", [0, 1, 5])
+def test_clears_stage_1(game, monkeypatch, seed):
+    # the widest gap of stage 1 is a bit higher than a default jump
+    monkeypatch.setattr(settings, "PLAYER_STRENGTH", -21)
+    result = game.simulate(ClimbingController(), settings.FPS * 60, seed)
+    assert result["clears"]
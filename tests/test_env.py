@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+import controller
+
+numpy = pytest.importorskip("numpy")
+
+from env import VecEnv  # noqa: E402
+
+
+class Commands(object):
+    def __init__(self):
+        self.commands = 0
+
+    def read(self, game):
+        return self.commands
+
+
+def test_games_share_their_assets_and_play_like_updates(game, monkeypatch):
+    env = VecEnv(3)
+    commands = Commands()
+    monkeypatch.setattr(game, "controller", commands)
+    rng = random.Random(1)
+    choices = [
+        0,
+        controller.LEFT,
+        controller.RIGHT | controller.JUMP,
+        controller.LEFT | controller.JUMP,
+        controller.CUT_JUMP,
+    ]
+    try:
+        env.reset(seed=7)
+        assert env.games[1].screen is env.games[0].screen
+        assert env.games[1].spritesheet is env.games[0].spritesheet
+        actions = [
+            [rng.choice(choices) for _ in range(env.size)] for _ in range(600)
+        ]
+        # every game is followed until it is first done
+        played = [[] for _ in range(env.size)]
+        done = [False] * env.size
+        for step in actions:
+            _, _, dones, _ = env.step(numpy.array(step))
+            for index, other in enumerate(env.games):
+                done[index] = done[index] or dones[index]
+                if not done[index]:
+                    player = other.player
+                    played[index].append((*player.pos, player.score))
+        assert any(len(positions) > 100 for positions in played)
+        for index, positions in enumerate(played):
+            game.start(7 + index)
+            game.playing = True
+            for number, position in enumerate(positions):
+                commands.commands = actions[number][index]
+                game.update()
+                player = game.player
+                assert (*player.pos, player.score) == position
+    finally:
+        env.close()
@@ -0,0 +1,62 @@
+import os
+
+import settings
+from controller import ClimbingController
+from game import Game
+from level import LevelRepository
+from sprite.items import Carrot
+
+
+def test_last_file_stage_is_cleared_by_a_carrot(game, tmp_path, monkeypatch):
+    file_name = tmp_path / "platforms.csv"
+    file_name.write_text(
+        "ground_sand.png,15,580,\nground_sand_small.png,150,480,\n"
+    )
+    monkeypatch.setattr(game, "levels", LevelRepository(str(file_name)))
+    game.start(1)
+    # the generated stages are loaded ahead of the stage clear
+    assert game.stage == 1
+    assert game.loaded == 2
+    carrots = [item for item in game.items if isinstance(item, Carrot)]
+    assert [carrot.platform.rect.top for carrot in carrots] == [480]
+    game.stage_clear(carrots[0].stage)
+    assert game.stage == 2
+    assert game.clears == [game.frame]
+    assert game.loaded == 2
+
+
+def test_generated_stages_are_cleared_in_a_row(game, monkeypatch):
+    # the widest gap of stage 1 is a bit higher than a default jump
+    monkeypatch.setattr(settings, "PLAYER_STRENGTH", -21)
+    cleared = []
+    stage_clear = game.stage_clear
+
+    def record(stage=None):
+        cleared.append(max(stage or game.stage, game.stage))
+        stage_clear(stage)
+
+    monkeypatch.setattr(game, "stage_clear", record)
+    # the spring of each clear flies higher than a generated stage, the
+    # next stages are loaded ahead so there are still platforms to land
+    result = game.simulate(ClimbingController(), settings.FPS * 30, seed=5)
+    first = len(game.levels) + 1
+    assert cleared[-2:] == [first, first + 1]
+    assert result["stage"] > first + 1
+
+
+def test_moving_sprites_keep_their_previous_positions(game):
+    game.start(1)
+    enemy = game.new_enemy((0, round(game.camera.top()) + 100))
+    player, enemy_at = game.player.rect.topleft, enemy.rect.topleft
+    game.update()
+    assert game.player.previous == player
+    assert enemy.previous == enemy_at
+
+
+def test_headless_games_leave_the_drivers_alone(monkeypatch):
+    monkeypatch.delenv("SDL_VIDEODRIVER", raising=False)
+    monkeypatch.delenv("SDL_AUDIODRIVER", raising=False)
+    game = Game(headless=True)
+    game.assets.close()
+    assert "SDL_VIDEODRIVER" not in os.environ
+    assert "SDL_AUDIODRIVER" not in os.environ
@@ -0,0 +1,77 @@
+import pygame
+
+from sprite.groups import GridGroup
+
+
+def block(group, x, y, width=20, height=20):
+    sprite = pygame.sprite.Sprite(group)
+    sprite.rect = pygame.Rect(x, y, width, height)
+    return sprite
+
+
+def test_near_skips_far_rows():
+    group = GridGroup(cell_size=50)
+    close = block(group, 0, 100)
+    far = block(group, 0, 1000)
+    found = group.near(pygame.Rect(0, 110, 10, 10))
+    assert close in found
+    assert far not in found
+
+
+def test_move_follows_the_sprite():
+    group = GridGroup(cell_size=50)
+    sprite = block(group, 0, 100)
+    group.near(sprite.rect)
+    sprite.rect.y = 1000
+    group.move(sprite)
+    assert sprite in group.near(pygame.Rect(0, 1000, 10, 10))
+    assert sprite not in group.near(pygame.Rect(0, 100, 10, 10))
+
+
+def test_collide_tests_rects_first():
+    group = GridGroup(cell_size=50)
+    hit = block(group, 0, 0)
+    block(group, 100, 0)
+    player = pygame.sprite.Sprite()
+    player.rect = pygame.Rect(10, 10, 20, 20)
+    tested = []
+
+    def collided(one, other):
+        tested.append(other)
+        return True
+
+    assert group.collide(player, collided=collided) == [hit]
+    assert tested == [hit]
+    assert group.narrow_tests == 1
+
+
+def test_collide_first():
+    group = GridGroup(cell_size=50)
+    block(group, 0, 0)
+    block(group, 5, 5)
+    player = pygame.sprite.Sprite()
+    player.rect = pygame.Rect(10, 10, 20, 20)
+    assert len(group.collide(player, first=True)) == 1
+
+
+def test_collide_kills():
+    group = GridGroup(cell_size=50)
+    hit = block(group, 0, 0)
+    player = pygame.sprite.Sprite()
+    player.rect = pygame.Rect(10, 10, 20, 20)
+    group.collide(player, dokill=True)
+    assert not hit.alive()
+    assert group.near(player.rect) == []
+
+
+def test_highest_below_above():
+    group = GridGroup(cell_size=50)
+    top = block(group, 0, -500)
+    middle = block(group, 0, 0)
+    bottom = block(group, 0, 500)
+    assert group.highest() is top
+    assert set(group.below(0)) == {middle, bottom}
+    assert set(group.above(0)) == {top}
+    top.kill()
+    assert group.highest() is middle
+    assert GridGroup().highest() is None
@@ -0,0 +1,96 @@
+import settings
+from level import LevelGenerator, LevelRepository, RowStream
+
+
+def write_level(tmp_path, text):
+    file_name = tmp_path / "platforms.csv"
+    file_name.write_text(text)
+    return str(file_name)
+
+
+def test_stages(tmp_path):
+    file_name = write_level(
+        tmp_path,
+        "ground_sand.png,15,580,\n"
+        "ground_sand_small.png,150,480,carrot\n"
+        "\n"
+        "ground_sand.png,160,-100,\n"
+        "\n"
+        "\n"
+        "ground_grass.png,160,-300,\n"
+        "\n",
+    )
+    levels = LevelRepository(file_name)
+    assert len(levels) == 3
+    assert list(levels.rows(1)) == [
+        ("ground_sand.png", 15, 580, ""),
+        ("ground_sand_small.png", 150, 480, "carrot"),
+    ]
+    assert list(levels.rows(2)) == [("ground_sand.png", 160, -100, "")]
+    assert list(levels.rows(3)) == [("ground_grass.png", 160, -300, "")]
+    assert list(levels.rows(4)) == []
+
+
+def test_materials_do_not_split_stages(tmp_path):
+    file_name = write_level(
+        tmp_path,
+        "ground_sand.png,15,580,\n" "ground_grass.png,160,-100,\n",
+    )
+    levels = LevelRepository(file_name)
+    assert len(levels) == 1
+    assert len(list(levels.rows(1))) == 2
+
+
+def test_empty_file(tmp_path):
+    levels = LevelRepository(write_level(tmp_path, ""))
+    assert len(levels) == 0
+    assert list(levels.rows(1)) == []
+
+
+def test_rows_are_read_as_they_are_built():
+    read = []
+
+    def rows():
+        for y in range(0, -500, -100):
+            read.append(y)
+            yield "ground_sand.png", 0, y, ""
+
+    stream = RowStream(rows(), 0)
+    assert stream.put_on_highest("spring")
+    assert read == [0, -100]
+    built = list(iter(stream.pop, None))
+    assert [row[3] for row in built] == ["", "", "", "", "spring"]
+    assert not stream.put_on_highest("spring")
+
+
+def test_generated_gaps_are_reachable():
+    generator = LevelGenerator(1234, {"ground_grass.png": 150})
+    height = settings.CHUNK_HEIGHT
+    try:
+        for index in range(20):
+            rows = generator.make_chunk(index)
+            # every chunk climbs to the anchor of the next one
+            next_anchor = (
+                None,
+                generator.anchor(index + 1),
+                -height * (index + 1),
+                "",
+            )
+            rows.append(next_anchor)
+            for low, high in zip(rows, rows[1:]):
+                gap = low[2] - high[2]
+                assert gap <= generator.max_gap() + 1
+                assert abs(high[1] - low[1]) <= generator.reach(gap)
+    finally:
+        generator.close()
+
+
+def test_generated_stages_are_seeded():
+    widths = {"ground_grass.png": 150, "ground_grass_small.png": 80}
+    first = LevelGenerator(1, widths)
+    second = LevelGenerator(1, widths)
+    try:
+        assert list(first.rows(1)) == list(second.rows(1))
+    finally:
+        first.close()
+        second.close()
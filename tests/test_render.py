@@ -0,0 +1,24 @@
+import settings
+from render import DirtyRenderer
+
+
+def test_dirty_frames_follow_the_full_ones(game):
+    game.start(1)
+    renderer = DirtyRenderer(game)
+    renderer.draw()
+    renderer.invalidate()
+    renderer.draw()
+    assert (renderer.frames, renderer.full_frames) == (2, 2)
+
+    # nothing moved, only the score is painted again
+    renderer.draw()
+    still = renderer.fraction
+    assert still < 0.05
+
+    # a moved sprite repaints where it was and where it is
+    player = game.player.rect
+    player.x += player.width * 2
+    renderer.draw()
+    area = player.width * player.height
+    moved = renderer.fraction - still
+    assert moved * settings.WIDTH * settings.HEIGHT >= 2 * area
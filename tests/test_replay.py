@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+import replay
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+
+def test_round_trip(tmp_path):
+    file_name = str(tmp_path / "game.rep")
+    commands = bytearray([0, 1, 2, 4, 8, 15, 6])
+    replay.save(file_name, 1234, commands)
+    assert replay.load(file_name) == (1234, commands)
+
+
+def test_not_a_replay(tmp_path):
+    file_name = tmp_path / "game.rep"
+    file_name.write_bytes(b"\0" * replay.HEADER.size)
+    with pytest.raises(ValueError):
+        replay.load(str(file_name))
+
+
+def test_cut_short(tmp_path):
+    file_name = str(tmp_path / "game.rep")
+    replay.save(file_name, 1234, bytearray([1, 2, 4, 8]))
+    with open(file_name, "r+b") as f:
+        f.truncate(replay.HEADER.size + 1)
+    with pytest.raises(ValueError):
+        replay.load(file_name)
+    with open(file_name, "r+b") as f:
+        f.truncate(4)
+    with pytest.raises(ValueError):
+        replay.load(file_name)
+
+
+def test_seeds_out_of_range(tmp_path):
+    file_name = tmp_path / "game.rep"
+    with pytest.raises(ValueError):
+        replay.save(str(file_name), -1, bytearray([1]))
+    assert not file_name.exists()
+
+
+def test_recorded_game(game):
+    """The physics and the scoring still play a recorded game the same."""
+    result = replay.play(game, os.path.join(DATA, "climb.rep"))
+    assert result["score"] == 21
+    assert result["height"] == 4767
+    assert result["frames"] == 883
+    assert result["death"] == "fall"
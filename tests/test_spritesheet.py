@@ -0,0 +1,24 @@
+import pytest
+
+from sprite.spritesheet import read_index, write_index
+
+
+def test_index_round_trip(tmp_path):
+    file_name = str(tmp_path / "sheet.baked.idx")
+    index = {"bunny1_stand.png": (0, 0, 120, 191), "carrot.png": (1, 2, 3, 4)}
+    write_index(file_name, index, 0.5)
+    assert read_index(file_name) == (index, 0.5)
+
+
+def test_long_names_are_refused(tmp_path):
+    file_name = tmp_path / "sheet.baked.idx"
+    with pytest.raises(ValueError):
+        write_index(str(file_name), {"a" * 33 + ".png": (0, 0, 1, 1)}, 1.0)
+    assert not file_name.exists()
+
+
+def test_not_an_index(tmp_path):
+    file_name = tmp_path / "sheet.baked.idx"
+    file_name.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        read_index(str(file_name))